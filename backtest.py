@@ -0,0 +1,155 @@
+"""
+네 가지 조건 기반 적정환율 신호의 과거 성과를 재현하는 백테스트
+
+실행 예시:
+    python backtest.py --pair jpy --weeks 104
+    python backtest.py --pair usd --windows 2 4 8 --min-conditions 2 3 4 --horizons 24 120
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import indicators
+import market_data
+import pairs
+
+
+def replay(index_close, quote_close, weeks, invert=False, precision=2):
+    """
+    과거의 모든 시간봉 시점에서 그 시점까지의 데이터만으로 지표와 조건을 다시 계산하는 함수
+    시점마다 반복하지 않고 시간 기준 rolling 연산으로 전체 기간을 한 번에 계산함
+    :param index_close: Series, 기준 지수 일봉 종가 (UTC 인덱스)
+    :param quote_close: Series, 환율 시간봉 종가 (UTC 인덱스)
+    :param weeks: int, 분석 기간(주)
+    :param invert: bool, 환율 시세의 역수를 원화 환율로 쓰는지 여부
+    :param precision: int, 환율 소수점 자리수
+    :return: DataFrame, 시간봉 시각을 인덱스로 하는 today_fx, estimate, 조건, 충족 조건 수
+    """
+    window = pd.Timedelta(weeks=weeks)
+    index_close = index_close.dropna().sort_index()
+    quote_close = quote_close.dropna().sort_index()
+    index_close.index = index_close.index.as_unit('ns')
+    quote_close.index = quote_close.index.as_unit('ns')
+    aligned = indicators.align(index_close, quote_close, invert)
+
+    # 일봉 통계는 거래일이 끝난 뒤에만 사용해서 미래 데이터를 보지 않도록 함
+    daily = pd.DataFrame({
+        'today_index': index_close,
+        'index_median': index_close.rolling(window).median(),
+        'index_mean': index_close.rolling(window).mean(),
+        'ratio_mean': aligned['gap_ratio'].rolling(window).mean().reindex(index_close.index).ffill(),
+    })
+    daily.index = daily.index + indicators.SESSION_LENGTH
+
+    hourly = pd.DataFrame({
+        'today_quote': quote_close,
+        'quote_median': quote_close.rolling(window).median(),
+        'quote_mean': quote_close.rolling(window).mean(),
+    })
+    merged = pd.merge_asof(hourly, daily, left_index=True, right_index=True, direction='backward')
+    merged = merged[merged.index >= quote_close.index[0] + window].dropna()  # 기간이 다 차기 전 구간은 제외
+
+    values = indicators.derive(
+        merged['today_index'].to_numpy(), merged['today_quote'].to_numpy(),
+        merged['index_median'].to_numpy(), merged['quote_median'].to_numpy(),
+        merged['index_mean'].to_numpy(), merged['quote_mean'].to_numpy(),
+        merged['ratio_mean'].to_numpy(), invert, precision)
+    columns = ['today_fx', 'estimate', 'condition1', 'condition2', 'condition3', 'condition4', 'suitable_conditions']
+    return pd.DataFrame({name: values[name] for name in columns}, index=merged.index)
+
+
+def forward_returns(replayed, horizon_hours):
+    """
+    각 시점에 원화를 외화로 바꿨을 때 horizon_hours 뒤의 수익률을 계산하는 함수
+    :param replayed: DataFrame, replay 결과
+    :param horizon_hours: int, 보유 기간(시간)
+    :return: Series, 수익률 (미래 시세가 없는 마지막 구간은 NaN)
+    """
+    times = replayed.index.tz_localize(None).to_numpy()
+    fx = replayed['today_fx'].to_numpy(dtype='float64')
+    positions = np.searchsorted(times, times + np.timedelta64(horizon_hours, 'h'), side='left')
+    future = np.full(len(fx), np.nan)
+    has_future = positions < len(fx)
+    future[has_future] = fx[positions[has_future]]
+    return pd.Series(future / fx - 1, index=replayed.index)
+
+
+def evaluate(replayed, min_conditions, horizon_hours, notional=1_000_000):
+    """
+    N개 이상의 조건을 만족할 때 환전하는 전략의 적중률과 손익을 계산하는 함수
+    :param replayed: DataFrame, replay 결과
+    :param min_conditions: int, 환전에 필요한 최소 충족 조건 수
+    :param horizon_hours: int, 보유 기간(시간)
+    :param notional: float, 신호마다 환전하는 원화 금액
+    :return: dict, 신호 수, 적중률, 평균 수익률, 총 손익 등
+    """
+    returns = forward_returns(replayed, horizon_hours)
+    valid = returns.notna()
+    signal = valid & (replayed['suitable_conditions'] >= min_conditions)
+    picked = returns[signal]
+    report = {
+        'min_conditions': min_conditions,
+        'horizon_hours': horizon_hours,
+        'signals': int(signal.sum()),
+        'hit_rate': float((picked > 0).mean()) if len(picked) else np.nan,
+        'avg_return': float(picked.mean()) if len(picked) else np.nan,
+        'total_pnl': float(picked.sum() * notional),
+        'base_hit_rate': float((returns[valid] > 0).mean()),  # 매 시점 환전했을 때의 적중률 (비교 기준)
+    }
+    for i in range(1, 5):
+        hits = returns[valid & replayed[f'condition{i}']]
+        report[f'condition{i}_hit_rate'] = float((hits > 0).mean()) if len(hits) else np.nan
+    return report
+
+
+def _evaluate_window(index_close, quote_close, weeks, min_conditions, horizons, invert, precision, notional):
+    # 작업 프로세스에서 분석 기간 하나에 대한 모든 조합을 계산
+    replayed = replay(index_close, quote_close, weeks, invert, precision)
+    rows = []
+    for horizon in horizons:
+        for n in min_conditions:
+            rows.append({'weeks': weeks, **evaluate(replayed, n, horizon, notional)})
+    return rows
+
+
+def run_sweep(index_close, quote_close, windows, min_conditions, horizons, invert=False, precision=2,
+              notional=1_000_000, workers=None):
+    """
+    분석 기간 x 최소 조건 수 x 보유 기간 조합을 여러 CPU 코어에 나눠 평가하는 함수
+    :param windows: list, 분석 기간(주) 목록 (기간마다 하나의 작업 프로세스에서 계산)
+    :param min_conditions: list, 최소 충족 조건 수 목록
+    :param horizons: list, 보유 기간(시간) 목록
+    :param workers: int, 작업 프로세스 수 (기본값: CPU 코어 수)
+    :return: DataFrame, 조합별 성과표
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_evaluate_window, index_close, quote_close, weeks, min_conditions, horizons, invert, precision, notional)
+            for weeks in windows
+        ]
+        rows = [row for future in futures for row in future.result()]
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='적정환율 신호 백테스트')
+    parser.add_argument('--pair', choices=sorted(pairs.PAIRS), default='jpy')
+    parser.add_argument('--weeks', type=int, default=104, help='불러올 과거 데이터 기간(주) - 야후 시간봉은 최대 약 2년')
+    parser.add_argument('--windows', type=int, nargs='+', default=indicators.WINDOWS)
+    parser.add_argument('--min-conditions', type=int, nargs='+', default=[1, 2, 3, 4])
+    parser.add_argument('--horizons', type=int, nargs='+', default=[24, 120, 480], help='보유 기간(시간)')
+    parser.add_argument('--notional', type=float, default=1_000_000, help='신호마다 환전하는 원화 금액')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    spec = pairs.PAIRS[args.pair]
+    index_data = market_data.fetch_history(spec.index_ticker, args.weeks)
+    quote_data = market_data.fetch_history(spec.fx_ticker, args.weeks, '1h')
+
+    result = run_sweep(
+        index_data['Close'], quote_data['Close'], args.windows, args.min_conditions, args.horizons,
+        spec.invert, spec.precision, args.notional, args.workers)
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(result.sort_values(['horizon_hours', 'weeks', 'min_conditions']).to_string(index=False))
@@ -0,0 +1,222 @@
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL,
+    PRIMARY KEY (ticker, interval, ts)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    start_ts INTEGER NOT NULL,
+    PRIMARY KEY (ticker, interval)
+);
+"""
+
+
+def _to_epoch(timestamp):
+    return int(pd.Timestamp(timestamp).timestamp())
+
+
+def normalize_frame(data):
+    """
+    야후파이낸스 결과를 저장 가능한 형태(OHLCV 단일 컬럼, UTC 인덱스)로 정리하는 함수
+    :param data: DataFrame, yf.download 결과
+    :return: DataFrame, Open/High/Low/Close/Volume 컬럼과 UTC 인덱스를 가진 데이터
+    """
+    data = data.copy()
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)  # (Price, Ticker) 형태의 컬럼 정리
+    data = data.reindex(columns=COLUMNS)
+    if data.index.tz is None:
+        data.index = data.index.tz_localize('UTC')
+    else:
+        data.index = data.index.tz_convert('UTC')
+    return data.dropna(subset=['Close'])
+
+
+def select_ticker(data, ticker):
+    """
+    여러 티커를 한 번에 받은 결과에서 티커 하나의 데이터를 꺼내는 함수
+    :param data: DataFrame, yf.download 결과 ((Price, Ticker) 형태의 컬럼)
+    :param ticker: str, 꺼낼 티커
+    :return: DataFrame 또는 None, 해당 티커가 없으면 None
+    """
+    if data is None or not isinstance(data.columns, pd.MultiIndex):
+        return data
+    for level in range(data.columns.nlevels):
+        if ticker in data.columns.get_level_values(level):
+            return data.xs(ticker, axis=1, level=level)
+    return None
+
+
+class BarStore:
+    """
+    티커/봉 간격별 OHLC 데이터를 로컬 SQLite 파일에 쌓아두는 저장소
+    새로고침할 때마다 마지막으로 저장된 봉 이후의 데이터만 받아서 이어 붙인다
+    """
+
+    def __init__(self, path):
+        """
+        :param path: str, SQLite 파일 경로
+        """
+        self.path = path
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')  # 읽기와 쓰기를 동시에 허용
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # 스트림릿 세션 스레드마다 안전하게 쓰도록 호출마다 연결을 새로 열고 닫음
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def last_timestamp(self, ticker, interval):
+        """
+        저장된 마지막 봉의 시각을 반환하는 함수
+        :return: Timestamp 또는 None, 저장된 봉이 없으면 None
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT MAX(ts) FROM bars WHERE ticker = ? AND interval = ?', (ticker, interval)).fetchone()
+        return None if row[0] is None else pd.Timestamp(row[0], unit='s', tz='UTC')
+
+    def covered_since(self, ticker, interval):
+        """
+        지금까지 다운로드를 요청한 가장 이른 시각을 반환하는 함수
+        (휴장일 때문에 첫 봉이 요청 시작보다 늦을 수 있어 봉 시각과 따로 관리)
+        :return: Timestamp 또는 None
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT start_ts FROM coverage WHERE ticker = ? AND interval = ?', (ticker, interval)).fetchone()
+        return None if row is None else pd.Timestamp(row[0], unit='s', tz='UTC')
+
+    def write(self, ticker, interval, data):
+        """
+        봉 데이터를 저장하는 함수 (같은 시각의 봉은 새 값으로 덮어써서 수정된 마지막 봉을 반영)
+        :param data: DataFrame, normalize_frame으로 정리된 데이터
+        """
+        rows = [
+            (ticker, interval, _to_epoch(ts), *(None if pd.isna(v) else float(v) for v in values))
+            for ts, values in zip(data.index, data[COLUMNS].itertuples(index=False, name=None))
+        ]
+        with self._connect() as conn:
+            conn.executemany('INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def mark_covered(self, ticker, interval, start):
+        """
+        다운로드를 요청한 구간의 시작 시각을 기록하는 함수
+        소스가 봉을 돌려준 경우에만 호출함 (다운로드 실패로 받은 빈 결과까지 기록하면 빈 구간을 다시 받지 않게 됨)
+        :param start: datetime, 이번 다운로드 요청의 시작 시각
+        """
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO coverage VALUES (?, ?, ?) '
+                'ON CONFLICT(ticker, interval) DO UPDATE SET start_ts = MIN(start_ts, excluded.start_ts)',
+                (ticker, interval, _to_epoch(start)))
+
+    def read(self, ticker, interval, start):
+        """
+        지정한 시각 이후의 봉 데이터를 읽는 함수
+        :param start: datetime, 분석 구간의 시작 시각
+        :return: DataFrame, OHLCV 컬럼과 UTC 인덱스를 가진 데이터
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT ts, open, high, low, close, volume FROM bars '
+                'WHERE ticker = ? AND interval = ? AND ts >= ? ORDER BY ts',
+                (ticker, interval, _to_epoch(start))).fetchall()
+        data = pd.DataFrame(rows, columns=['ts'] + COLUMNS)
+        data.index = pd.to_datetime(data.pop('ts'), unit='s', utc=True)
+        data.index.name = 'Datetime'
+        return data
+
+    def missing_ranges(self, ticker, interval, window_start, now):
+        """
+        분석 구간 중 아직 받지 않은 구간 목록을 계산하는 함수
+        :param window_start: datetime, 분석 구간의 시작 시각
+        :param now: datetime, 현재 시각
+        :return: list, (시작, 종료) 튜플 목록
+        """
+        covered = self.covered_since(ticker, interval)
+        last = self.last_timestamp(ticker, interval)
+
+        if covered is None or last is None or last < window_start:
+            # 저장된 데이터가 없거나 너무 오래됐으면 구간 전체를 받음
+            return [(window_start, now)]
+        # 마지막 봉부터 다시 받아서 수정된 마지막 봉을 덮어씀 (항상 봉이 있는 구간이라 소스가 응답하는지 먼저 확인하는 역할도 함)
+        ranges = [(last.to_pydatetime(), now)]
+        if window_start < covered:
+            ranges.append((window_start, covered.to_pydatetime()))  # 더 긴 구간을 요청하면 앞부분도 채움
+        return ranges
+
+    def refresh(self, ticker, interval, period_weeks, downloader):
+        """
+        분석 구간에서 비어 있는 부분만 다운로드해서 저장한 뒤 구간 데이터를 반환하는 함수
+        :param ticker: str, 야후파이낸스 티커
+        :param interval: str, 봉 간격
+        :param period_weeks: int, 분석 구간(주)
+        :param downloader: callable, (ticker, start, end, interval)을 받아 데이터프레임을 반환하는 함수
+        :return: DataFrame, 분석 구간으로 잘라낸 데이터
+        """
+        now = datetime.now(timezone.utc)
+        window_start = now - timedelta(weeks=period_weeks)
+
+        responded = False  # 이번 새로고침에서 소스가 봉을 돌려줬는지 여부
+        for start, end in self.missing_ranges(ticker, interval, window_start, now):
+            data = downloader(ticker, start, end, interval)
+            data = None if data is None or data.empty else normalize_frame(data)
+            if data is not None and not data.empty:
+                self.write(ticker, interval, data)
+                responded = True
+            if responded:
+                # 소스가 응답하는데도 비어 있는 앞부분(휴장일, 상장 전)은 받은 것으로 기록해서 매번 다시 받지 않도록 함
+                self.mark_covered(ticker, interval, start)
+
+        return self.read(ticker, interval, window_start)
+
+    def refresh_many(self, tickers, interval, period_weeks, downloader):
+        """
+        여러 티커의 비어 있는 구간을 한 번의 묶음 다운로드로 채운 뒤 티커별 구간 데이터를 반환하는 함수
+        :param tickers: list, 야후파이낸스 티커 목록
+        :param interval: str, 봉 간격
+        :param period_weeks: int, 분석 구간(주)
+        :param downloader: callable, (티커 목록, start, end, interval)을 받아 데이터프레임을 반환하는 함수
+        :return: dict, 티커 -> 분석 구간으로 잘라낸 DataFrame
+        """
+        now = datetime.now(timezone.utc)
+        window_start = now - timedelta(weeks=period_weeks)
+        starts = {
+            ticker: min(range_start for range_start, _ in self.missing_ranges(ticker, interval, window_start, now))
+            for ticker in tickers
+        }
+
+        # 앞부분부터 채워야 하는 티커(분석 구간 시작부터)와 마지막 봉 이후만 받으면 되는 티커를 따로 묶어서 받음
+        # (한 티커의 빈 구간 때문에 나머지 티커까지 분석 구간 전체를 다시 받지 않도록 함)
+        backfill = [ticker for ticker in tickers if starts[ticker] <= window_start]
+        recent = [ticker for ticker in tickers if starts[ticker] > window_start]
+        for group in (backfill, recent):
+            if not group:
+                continue
+            start = min(starts[ticker] for ticker in group)
+            data = downloader(group, start, now, interval)
+            for ticker in group:
+                part = select_ticker(data, ticker)
+                part = None if part is None or part.empty else normalize_frame(part)
+                if part is not None and not part.empty:
+                    self.write(ticker, interval, part)
+                    self.mark_covered(ticker, interval, start)
+
+        return {ticker: self.read(ticker, interval, window_start) for ticker in tickers}
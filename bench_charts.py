@@ -0,0 +1,55 @@
+"""
+추세 차트 데이터 준비(charts.prepare)의 점 수 / 크기 / 시간을 원본과 비교하는 스크립트
+
+실행 예시:
+    python bench_charts.py
+    python bench_charts.py --rows 2208 100000 --budget 300
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import charts
+
+COLUMNS = ['적정원엔환율', '현재원엔환율']
+
+
+def make_trend(count, seed=1):
+    # 시간 단위 추세 데이터 (가끔 급등락이 섞인 랜덤 워크)
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.002, count)
+    steps[rng.random(count) < 0.001] *= 30
+    now = 9.1 * np.exp(np.cumsum(steps))
+    return pd.DataFrame({
+        '현재날짜': pd.date_range(end='2026-10-16 05:00', periods=count, freq='h'),
+        '적정원엔환율': pd.Series(now).rolling(24, min_periods=1).mean().to_numpy(),
+        '현재원엔환율': now,
+    })
+
+
+def payload_bytes(data):
+    # 차트로 보내는 데이터와 비슷한 크기 (JSON 직렬화 기준)
+    return len(data.reset_index().to_json(orient='records', date_format='iso').encode())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='차트 데이터 준비 측정')
+    parser.add_argument('--rows', type=int, nargs='+', default=[200, 2208, 20000, 100000])
+    parser.add_argument('--budget', type=int, default=charts.CHART_POINTS, help='차트 하나의 최대 점 수')
+    args = parser.parse_args()
+
+    print(f"{'행 수':>8s} {'원본(KB)':>9s} {'점 수':>6s} {'줄인(KB)':>9s} {'처음(ms)':>9s} {'캐시(ms)':>9s} {'최대값 유지':>10s}")
+    for count in args.rows:
+        frame = make_trend(count)
+        start = time.perf_counter()
+        data = charts.prepare(frame, COLUMNS, '현재날짜', budget=args.budget)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        charts.prepare(frame, COLUMNS, '현재날짜', budget=args.budget)
+        cached = time.perf_counter() - start
+        keeps_peak = all(data[column].max() == frame[column].max() and data[column].min() == frame[column].min()
+                         for column in COLUMNS)
+        print(f"{count:8d} {payload_bytes(frame.set_index('현재날짜')) / 1024:9.0f} {len(data):6d} "
+              f"{payload_bytes(data) / 1024:9.0f} {cold * 1000:9.1f} {cached * 1000:9.2f} {str(keeps_peak):>10s}")
@@ -0,0 +1,132 @@
+"""
+녹화된 응답(sources.py 재생 모드)으로 여러 화면 세션을 동시에 실행해 처리량과 렌더링 지연 시간을 재는 부하 생성기
+
+세션마다 Streamlit AppTest로 화면 스크립트를 반복 실행함 (모든 세션이 한 프로세스의 캐시/저장소를 공유하는 실제 서버와 같음)
+재생 모드이므로 야후파이낸스 / 스프레드시트 / 인베스팅닷컴 요청은 네트워크 없이 REPLAY_LATENCY만큼만 걸림
+
+실행 예시:
+    DATA_SOURCE=record streamlit run yen.py          # 실제 응답 녹화 (화면을 몇 번 열어 둠)
+    python bench_load.py --sessions 8 --renders 5     # 녹화된 응답으로 부하 측정
+    python bench_load.py --synthetic --latency yahoo=0.5,sheets=0.2,investing=0.3   # 가상 녹화를 만들어 측정
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+# 인베스팅닷컴 가격 페이지 (yen.py와 같음)
+INVESTING_URL = 'https://kr.investing.com/currencies/jpy-krw'
+
+# 가상 녹화에 넣을 기간(주) - 화면의 가장 긴 비교 기간(indicators.WINDOWS)보다 길게 둠
+SYNTHETIC_WEEKS = 60
+
+
+def record_synthetic(sheet_rows):
+    """
+    네트워크 없이 측정할 수 있도록 가상 응답을 RECORD_DIR에 녹화하는 함수
+    시세는 bench_pipeline의 가상 OHLC, 시트는 fake_sheets의 행, 인베스팅닷컴은 fixtures/investing의 페이지를 사용
+    :param sheet_rows: int, 시트당 행 수
+    """
+    import bench_pipeline
+    import bench_quotes
+    import fake_sheets
+    import pairs
+    import sources
+
+    now = datetime.now(timezone.utc)
+    tickers = {ticker for spec in pairs.PAIRS.values() for ticker in (spec.index_ticker, spec.fx_ticker)}
+    for ticker in tickers:
+        for interval, weeks in [('1d', SYNTHETIC_WEEKS), ('1h', SYNTHETIC_WEEKS), ('1m', 1)]:
+            data = bench_pipeline.synthetic_download(ticker, now - timedelta(weeks=weeks), now, interval)
+            data.columns = data.columns.get_level_values(0)
+            sources.save('yahoo', (ticker, interval), data)
+
+    rows = fake_sheets.make_rows(sheet_rows)
+    sources.save('sheets', 'rows', {
+        sheet: {'rows': dict(enumerate(sheet_rows_[1:], start=2)), 'end': len(sheet_rows_)}
+        for sheet, sheet_rows_ in rows.items()})
+    sources.save('sheets', 'grid', {sheet: len(sheet_rows_) for sheet, sheet_rows_ in rows.items()})
+
+    page = bench_quotes.load_fixture('jpy-krw.html')
+    sources.save('investing', INVESTING_URL, (page, {'Content-Type': 'text/html; charset=utf-8'}))
+
+
+def run_session(script, renders, timeout, latencies, errors):
+    # 세션 하나: 같은 AppTest로 화면을 renders번 다시 실행 (사용자가 새로고침하거나 입력을 바꾸는 경우)
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(script, default_timeout=timeout)
+    for _ in range(renders):
+        start = time.perf_counter()
+        try:
+            app.run()
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        latencies.append(time.perf_counter() - start)
+        errors.extend(element.value for element in app.error)
+
+
+def run_load(script, sessions, renders, timeout):
+    """
+    세션 여러 개를 동시에 실행하고 결과를 반환하는 함수
+    :return: tuple, (렌더링 지연 시간 목록(초), 오류 메시지 목록, 전체 경과 시간(초))
+    """
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=run_session, args=(script, renders, timeout, latencies, errors))
+        for _ in range(sessions)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='재생 모드 부하 측정')
+    parser.add_argument('scripts', nargs='*', default=['yen.py', 'dollar.py'])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 4, 16], help='동시 세션 수 목록')
+    parser.add_argument('--renders', type=int, default=5, help='세션마다 화면을 실행하는 횟수')
+    parser.add_argument('--timeout', type=float, default=60, help='화면 한 번의 제한 시간(초)')
+    parser.add_argument('--latency', default=None, help='재생 지연 시간 (예: 0.2 또는 yahoo=0.5,sheets=0.2)')
+    parser.add_argument('--record-dir', default=None, help='녹화 디렉터리 (기본값: RECORD_DIR 또는 recordings)')
+    parser.add_argument('--synthetic', action='store_true', help='가상 응답을 녹화한 뒤 측정')
+    parser.add_argument('--sheet-rows', type=int, default=1000, help='가상 녹화의 시트당 행 수')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-load-')
+    # 화면 모듈을 불러오기 전에 재생 모드와 임시 저장소를 설정 (실제 봉 저장소 / 지표 저장소를 건드리지 않음)
+    os.environ['DATA_SOURCE'] = 'replay'
+    os.environ['RECORD_DIR'] = args.record_dir or os.environ.get('RECORD_DIR') or (
+        os.path.join(workdir, 'recordings') if args.synthetic else 'recordings')
+    if args.latency is not None:
+        os.environ['REPLAY_LATENCY'] = args.latency
+    os.environ['BAR_STORE_PATH'] = os.path.join(workdir, 'bars.sqlite3')
+    os.environ['ESTIMATE_STORE_PATH'] = os.path.join(workdir, 'estimates.sqlite3')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    if args.synthetic:
+        record_synthetic(args.sheet_rows)
+
+    print(f"녹화: {os.environ['RECORD_DIR']}, 재생 지연: {os.environ.get('REPLAY_LATENCY', '0')}")
+    print(f"{'화면':10s} {'세션':>4s} {'렌더링':>6s} {'처리량(회/초)':>12s} {'중앙값(ms)':>10s} {'p95(ms)':>9s} {'오류':>4s}")
+    for script in args.scripts:
+        script = os.path.abspath(script)
+        for sessions in args.sessions:
+            latencies, errors, elapsed = run_load(script, sessions, args.renders, args.timeout)
+            if latencies:
+                p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+                median = statistics.median(latencies)
+            else:
+                p95 = median = float('nan')
+            print(f"{os.path.basename(script):10s} {sessions:4d} {len(latencies):6d} {len(latencies) / elapsed:12.2f} "
+                  f"{median * 1000:10.0f} {p95 * 1000:9.0f} {len(errors):4d}")
+            for error in sorted(set(errors))[:3]:
+                print(f"  오류: {error}")
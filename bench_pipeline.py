@@ -0,0 +1,176 @@
+"""
+다운로드 -> 지표 계산 -> 조건 확인 -> 시트 변환 / 가격 추출 단계별 실행 시간과 메모리를 측정하는 스크립트
+
+네트워크 없이 재현할 수 있도록 고정된 입력을 사용함
+- 시세: 티커별로 시드가 고정된 가상 OHLC (yfinance 묶음 다운로드와 같은 형태, 4주 ~ 10년)
+- 시트: fake_sheets.make_rows로 만든 행
+- 인베스팅닷컴: fixtures/investing의 저장된 페이지
+
+단계별로 반복 실행 시간(중앙값 / 최소값)을 재고, tracemalloc으로 한 번 실행할 때의 최대 메모리와 남은 메모리를 잼
+
+실행 예시:
+    python bench_pipeline.py
+    python bench_pipeline.py --weeks 4 520 --repeat 10
+    python bench_pipeline.py --cprofile indicators     # 해당 단계의 cProfile 상위 함수 출력
+"""
+import argparse
+import cProfile
+import os
+import pstats
+import statistics
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+import numpy as np
+import pandas as pd
+
+import bench_quotes
+import fake_sheets
+import indicators
+import market_data
+import pairs
+import quotes
+import sheets
+from bar_store import BarStore
+from market_cache import TTLCache
+
+# 측정할 통화쌍 (yen.py와 같음)
+PAIR_NAMES = ['jpy', 'usd']
+
+# 티커별 가상 시세 기준값
+BASES = {
+    '^N225': 38000,
+    'KRWJPY=X': 0.11,
+    'DX-Y.NYB': 104,
+    'USDKRW=X': 1350,
+}
+
+
+def synthetic_download(tickers, start, end, interval):
+    """
+    yfinance 묶음 다운로드 대신 쓰는 가상 OHLC 다운로더 (같은 요청에는 항상 같은 값)
+    :return: DataFrame, (Price, Ticker) 2단 컬럼과 UTC 인덱스를 가진 데이터
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    freq = {'1h': 'h', '1m': 'min'}.get(interval, 'D')
+    index = pd.date_range(pd.Timestamp(start).ceil(freq), pd.Timestamp(end), freq=freq)
+    index = index[index.dayofweek < 5]
+    frames = {}
+    for ticker in tickers:
+        rng = np.random.default_rng(zlib.crc32(f'{ticker} {interval}'.encode()))
+        close = BASES.get(ticker, 100) * np.exp(np.cumsum(rng.normal(0, 0.002, len(index))))
+        frames[ticker] = pd.DataFrame({
+            'Open': close, 'High': close * 1.001, 'Low': close * 0.999, 'Close': close, 'Volume': 0.0,
+        }, index=index)
+    return pd.concat(frames, axis=1).swaplevel(axis=1)
+
+
+def download(specs, weeks, store):
+    # pairs.load와 같은 묶음 다운로드 (캐시는 매번 새로 만들어 저장소 경로를 측정)
+    cache = TTLCache()
+    index_closes = market_data.fetch_closes(
+        [spec.index_ticker for spec in specs], weeks, '1d', synthetic_download, cache, store)
+    fx_closes = market_data.fetch_closes(
+        [spec.fx_ticker for spec in specs], weeks, '1h', synthetic_download, cache, store)
+    return index_closes, fx_closes
+
+
+def pipeline_stages(weeks, workdir):
+    """
+    분석 기간 하나에 대한 (단계 이름, 실행 함수) 목록을 만드는 함수
+    각 단계의 입력은 미리 만들어 두므로 실행 함수는 해당 단계만 실행함
+    """
+    specs = [pairs.PAIRS[name] for name in PAIR_NAMES]
+    windows = sorted(set(indicators.WINDOWS) | {weeks})
+    store = BarStore(os.path.join(workdir, f'bars-{weeks}.sqlite3'))
+    index_closes, fx_closes = download(specs, weeks, store)
+    aligned = pairs.align_all(specs, index_closes, fx_closes)
+    tables = {
+        spec.name: indicators.sweep(index_closes[spec.index_ticker], fx_closes[spec.fx_ticker], windows,
+                                    spec.invert, spec.precision, aligned=aligned[spec.name].dropna())
+        for spec in specs
+    }
+
+    def cold_download():
+        download(specs, weeks, BarStore(os.path.join(tempfile.mkdtemp(dir=workdir), 'bars.sqlite3')))
+
+    def sweep():
+        for spec in specs:
+            indicators.sweep(index_closes[spec.index_ticker], fx_closes[spec.fx_ticker], windows,
+                             spec.invert, spec.precision, aligned=aligned[spec.name].dropna())
+
+    def conditions():
+        for table in tables.values():
+            pairs.check_conditions(table.loc[weeks].to_dict())
+
+    return [
+        ('download (새 저장소)', cold_download),
+        ('download (저장소 적중)', lambda: download(specs, weeks, store)),
+        ('align', lambda: pairs.align_all(specs, index_closes, fx_closes)),
+        ('indicators', sweep),
+        ('conditions', conditions),
+    ]
+
+
+def other_stages(sheet_rows):
+    rows = fake_sheets.make_rows(sheet_rows)
+    sheet = rows['엔_4주'][1:]
+    pages = {name: bench_quotes.load_fixture(name) for name in bench_quotes.FIXTURES}
+    return [
+        (f'sheets.to_frame (마지막 {sheets.TREND_ROWS}행)', lambda: sheets.to_frame('jpy_history', sheet)),
+        (f'sheets.to_frame (전체 {sheet_rows}행)', lambda: sheets.to_frame('jpy_history', sheet, None)),
+        ('quotes.extract_price', lambda: [quotes.extract_price(page) for page in pages.values()]),
+    ]
+
+
+def measure(fn, repeat):
+    """
+    단계 하나의 실행 시간과 메모리를 재는 함수
+    :return: tuple, (중앙값 ms, 최소값 ms, 최대 메모리 KB, 남은 메모리 KB)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return statistics.median(times) * 1000, min(times) * 1000, (peak - baseline) / 1024, (current - baseline) / 1024
+
+
+def print_profile(fn, limit=15):
+    profiler = cProfile.Profile()
+    profiler.runcall(fn)
+    pstats.Stats(profiler).sort_stats('cumulative').print_stats(limit)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='단계별 실행 시간 / 메모리 측정')
+    parser.add_argument('--weeks', type=int, nargs='+', default=[4, 52, 260, 520], help='분석 기간(주) 목록')
+    parser.add_argument('--repeat', type=int, default=5, help='단계별 반복 횟수')
+    parser.add_argument('--sheet-rows', type=int, default=100000, help='시트 변환에 사용할 행 수')
+    parser.add_argument('--cprofile', default=None, help='cProfile 결과를 출력할 단계 이름 (앞부분 일치)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        stages = [(f'{weeks}주', name, fn) for weeks in args.weeks for name, fn in pipeline_stages(weeks, workdir)]
+        stages += [('-', name, fn) for name, fn in other_stages(args.sheet_rows)]
+
+        print(f"{'기간':>6s}  {'단계':32s} {'중앙값(ms)':>10s} {'최소(ms)':>9s} {'최대 메모리(KB)':>14s} {'남은 메모리(KB)':>14s}")
+        for period, name, fn in stages:
+            median, fastest, peak, retained = measure(fn, args.repeat)
+            print(f"{period:>6s}  {name:32s} {median:10.2f} {fastest:9.2f} {peak:14.0f} {retained:14.0f}")
+
+        if args.cprofile:
+            for period, name, fn in stages:
+                if name.startswith(args.cprofile):
+                    print(f"\n[{period} {name}]")
+                    print_profile(fn)
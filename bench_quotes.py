@@ -0,0 +1,147 @@
+"""
+저장해 둔 인베스팅닷컴 페이지(fixtures/investing)로 가격 추출기를 오프라인에서 검증하고 측정하는 스크립트
+
+실행 예시:
+    python bench_quotes.py                 # 추출 결과 확인 + 파싱 / 로컬 서버 요청 시간 측정
+    python bench_quotes.py --repeat 500
+"""
+import argparse
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lxml import etree
+
+import quotes
+from market_cache import TTLCache
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'investing')
+
+# 저장된 페이지 -> 기대하는 가격
+FIXTURES = {
+    'jpy-krw.html': '9.0312',
+    'jpy-krw-legacy.html': '9.0270',
+}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def legacy_extract(html):
+    # 기존 fetch_data와 같은 방식: 전체 문서를 파싱한 뒤 절대 경로로 찾음
+    tree = etree.HTML(html)
+    return "\n".join(text.strip() for text in tree.xpath(quotes.LEGACY_XPATH) if text.strip()) or None
+
+
+def measure(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def make_handler(pages, counts):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive 연결 재사용 확인용
+
+        def do_GET(self):
+            parts = self.path.strip('/').split('/')
+            mode, name = (parts[0], parts[1]) if len(parts) == 2 else ('ok', parts[0])
+            counts[mode] = counts.get(mode, 0) + 1
+            if name not in pages:
+                self.send_error(404)
+                return
+            if mode == 'flaky' and counts[mode] % 2 == 1:
+                self.send_error(503)  # 홀수 번째 요청은 실패 -> 재시도로 복구되는지 확인
+                return
+            if mode == 'slow':
+                time.sleep(quotes.READ_TIMEOUT + 1)
+
+            body = pages[name]
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # 제한 시간을 넘겨 클라이언트가 먼저 끊은 경우
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def check():
+    for name, expected in FIXTURES.items():
+        price = quotes.extract_price(load_fixture(name))
+        status = 'OK' if price == expected else f'실패 (기대값 {expected})'
+        print(f"{name}: {price!r} {status}")
+        assert price == expected
+
+
+def bench_parse(repeat):
+    print(f"\n[파싱 시간] {repeat}회 평균 (ms)")
+    for name in FIXTURES:
+        html = load_fixture(name)
+        targeted = measure(lambda: quotes.extract_price(html), repeat)
+        full = measure(lambda: legacy_extract(html), repeat)
+        print(f"{name:24s} {len(html) / 1024:6.1f}KB  전체 파싱 {full:7.3f}  가격 요소에서 중단 {targeted:7.3f}")
+
+
+def bench_fetch(repeat):
+    pages = {name: load_fixture(name) for name in FIXTURES}
+    counts = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(pages, counts))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    url = f"{base}/jpy-krw.html"
+    cache = TTLCache(maxsize=4)
+
+    print("\n[요청 시간] 로컬 서버 기준 (ms)")
+    start = time.perf_counter()
+    quotes.fetch_quote(url, cache=cache)
+    print(f"첫 요청 (200){(time.perf_counter() - start) * 1000:12.3f}")
+    print(f"캐시 적중{measure(lambda: quotes.fetch_quote(url, cache=cache), repeat):17.3f}")
+
+    def revalidate():
+        cache.clear()
+        quotes.fetch_quote(url, cache=cache)
+
+    print(f"ETag 재검증 (304){measure(revalidate, repeat):9.3f}")
+
+    start = time.perf_counter()
+    price = quotes.fetch_quote(f"{base}/flaky/jpy-krw.html", cache=cache)
+    print(f"503 후 재시도 성공{(time.perf_counter() - start) * 1000:9.3f}  ({price}, 서버 요청 {counts['flaky']}회)")
+
+    start = time.perf_counter()
+    try:
+        quotes.fetch_quote(f"{base}/slow/jpy-krw.html", cache=cache)
+    except Exception as e:
+        print(f"응답 지연 시 중단{(time.perf_counter() - start) * 1000:10.0f}  ({type(e).__name__}, 서버 요청 {counts['slow']}회)")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='인베스팅닷컴 가격 추출기 오프라인 측정')
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--skip-fetch', action='store_true', help='로컬 서버 요청 측정 생략')
+    args = parser.parse_args()
+
+    check()
+    bench_parse(args.repeat)
+    if not args.skip_fetch:
+        bench_fetch(args.repeat)
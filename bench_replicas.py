@@ -0,0 +1,114 @@
+"""
+여러 화면 프로세스(레플리카)가 외부 소스를 몇 번 호출하는지 공유 캐시(shared_cache.py) 사용 전후로 비교하는 스크립트
+
+레플리카마다 별도 프로세스에서 yen.py와 같은 데이터 작업(통화쌍 지표 계산, 스프레드시트 읽기, 인베스팅닷컴 가격)을
+여러 번 실행하고, 야후파이낸스 / 스프레드시트 / 인베스팅닷컴 호출 횟수와 작업 시간을 셈
+네트워크 없이 bench_load의 가상 녹화를 재생 모드로 사용하며, 레플리카마다 봉 저장소를 따로 둠 (서로 다른 호스트와 같음)
+
+실행 예시:
+    python bench_replicas.py
+    python bench_replicas.py --replicas 8 --rounds 5 --latency yahoo=0.5,sheets=0.2,investing=0.3
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# 측정할 데이터 작업 (yen.py와 같음)
+PAIR_NAMES = ['jpy', 'usd']
+SHEET_NAMES = ['jpy_trend', 'jpy_history', 'usd_trend', 'usd_history']
+
+
+def run_replica(env, rounds, start_at, results):
+    """
+    레플리카 하나: 같은 시각에 시작해서 데이터 작업을 rounds번 실행함
+    :param env: dict, 레플리카 프로세스의 환경 변수
+    :param rounds: int, 실행 횟수
+    :param start_at: float, 모든 레플리카가 함께 시작하는 시각 (time.time 기준)
+    :param results: Queue, (외부 호출 횟수, 작업 시간 목록)을 넣을 큐
+    """
+    os.environ.update(env)
+    os.environ['BAR_STORE_PATH'] = os.path.join(tempfile.mkdtemp(dir=env['WORKDIR']), 'bars.sqlite3')
+    import bench_load
+    import pairs
+    import quotes
+    import sheets
+    import sources
+
+    calls = Counter()
+
+    def counted(source, fn):
+        def wrapper(*args, **kwargs):
+            calls[source] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+    sources.yahoo_download = counted('yahoo', sources.yahoo_download)
+    sources.sheets_batch_get = counted('sheets', sources.sheets_batch_get)
+    sources.http_get = counted('investing', sources.http_get)
+
+    time.sleep(max(0, start_at - time.time()))
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        pairs.evaluate(PAIR_NAMES)
+        sheets.read_frames(SHEET_NAMES)
+        quotes.fetch_quote(bench_load.INVESTING_URL)
+        durations.append(time.perf_counter() - start)
+    results.put((dict(calls), durations))
+
+
+def run_replicas(replicas, rounds, env):
+    """
+    레플리카 여러 개를 동시에 실행하고 결과를 모으는 함수
+    :return: tuple, (소스별 외부 호출 횟수 합계, 전체 작업 시간 목록(초))
+    """
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    start_at = time.time() + 3  # 프로세스 시작 / 모듈 불러오기가 끝난 뒤 함께 시작
+    processes = [context.Process(target=run_replica, args=(env, rounds, start_at, results)) for _ in range(replicas)]
+    for process in processes:
+        process.start()
+    calls, durations = Counter(), []
+    for _ in processes:
+        replica_calls, replica_durations = results.get()
+        calls.update(replica_calls)
+        durations.extend(replica_durations)
+    for process in processes:
+        process.join()
+    return calls, durations
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='레플리카별 외부 호출 횟수 측정')
+    parser.add_argument('--replicas', type=int, default=4, help='레플리카(프로세스) 수')
+    parser.add_argument('--rounds', type=int, default=3, help='레플리카마다 데이터 작업을 실행하는 횟수')
+    parser.add_argument('--latency', default='yahoo=0.5,sheets=0.2,investing=0.3', help='재생 지연 시간')
+    parser.add_argument('--sheet-rows', type=int, default=1000, help='가상 녹화의 시트당 행 수')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-replicas-')
+    os.environ['DATA_SOURCE'] = 'replay'
+    os.environ['RECORD_DIR'] = os.path.join(workdir, 'recordings')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import bench_load
+    bench_load.record_synthetic(args.sheet_rows)
+
+    print(f"레플리카 {args.replicas}개 x {args.rounds}회, 재생 지연: {args.latency}")
+    print(f"{'공유 캐시':24s} {'야후':>5s} {'시트':>5s} {'인베스팅':>8s} {'중앙값(ms)':>10s} {'최대(ms)':>9s}")
+    for label, shared in [('사용 안 함', ''), ('sqlite (파일 하나)', 'sqlite:///' + os.path.join(workdir, 'shared.sqlite3'))]:
+        env = {
+            'DATA_SOURCE': 'replay',
+            'RECORD_DIR': os.environ['RECORD_DIR'],
+            'REPLAY_LATENCY': args.latency,
+            'WORKDIR': workdir,  # 레플리카마다 이 아래에 봉 저장소를 따로 만듦
+            'ESTIMATE_STORE_PATH': os.path.join(workdir, 'estimates.sqlite3'),
+            'SHARED_CACHE': shared,
+        }
+        calls, durations = run_replicas(args.replicas, args.rounds, env)
+        print(f"{label:24s} {calls['yahoo']:5d} {calls['sheets']:5d} {calls['investing']:8d} "
+              f"{statistics.median(durations) * 1000:10.0f} {max(durations) * 1000:9.0f}")
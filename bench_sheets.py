@@ -0,0 +1,86 @@
+"""
+시트 전체 읽기와 마지막 행만 읽기(sheets.read_tails)를 가짜 Sheets 서버로 비교하는 스크립트
+
+시트 행 수를 늘려가며 한 번 읽는 시간과 응답 크기를 측정함
+- 전체: 열린 범위(A2:F)를 읽고 변환 (이전 방식)
+- 처음: 마지막 행 위치를 모르는 상태에서 읽기 (격자 크기 조회 포함, 데이터 이름별 sheets.TAIL_ROWS개 행)
+- 이후: 위치를 기억한 상태에서 읽기 (매번 수집기가 한 행씩 추가한다고 가정)
+
+실행 예시:
+    python bench_sheets.py
+    python bench_sheets.py --rows 1000 100000 --empty-rows 500
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta
+
+import fake_sheets
+
+NAMES = ['jpy_trend', 'jpy_history', 'usd_trend', 'usd_history']
+
+
+def append_row(fake, count):
+    # 수집기가 시트마다 한 시간치 행을 추가한 것처럼 만듦
+    rows = fake_sheets.make_rows(1, start=datetime(2030, 1, 1) + timedelta(hours=count))
+    for name, sheet_rows in rows.items():
+        fake.sheets[name].append(sheet_rows[1])
+
+
+def reset(sheets):
+    # 프로세스를 새로 시작한 것처럼 기억해 둔 위치와 캐시를 지움
+    sheets._grid_cache.invalidate('grid')
+    with sheets._row_ends_lock:
+        sheets._row_ends.clear()
+    with sheets._parsed_lock:
+        sheets._parsed.clear()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def measure(sheets, fake, reads):
+    full, full_time = timed(lambda: sheets.batch_get([sheets.a1_range(name, sheets.FIRST_ROW) for name in NAMES]))
+    full_bytes = len(json.dumps(full, ensure_ascii=False).encode())
+    _, parse_time = timed(lambda: [sheets.to_frame(name, rows) for name, rows in zip(NAMES, full)])
+
+    reset(sheets)
+    tails, cold_time = timed(lambda: sheets.read_tails(NAMES))
+    assert tails == [rows[-sheets.TAIL_ROWS[name]:] for name, rows in zip(NAMES, full)], "마지막 행이 전체 읽기와 다릅니다"
+
+    warm = []
+    for k in range(reads):
+        append_row(fake, k)
+        tails, elapsed = timed(lambda: sheets.read_tails(NAMES))
+        _, parse = timed(lambda: [sheets.parse(name, rows) for name, rows in zip(NAMES, tails)])
+        warm.append(elapsed + parse)
+        latest = {name: rows[-1] for name, rows in fake.sheets.items()}
+        assert all(rows[-1] == latest[sheets.RANGES[name][0]] for name, rows in zip(NAMES, tails)), "추가한 행이 없습니다"
+    tail_bytes = len(json.dumps(tails, ensure_ascii=False).encode())
+    return full_time + parse_time, full_bytes, cold_time, statistics.median(warm), tail_bytes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='시트 전체 읽기 / 마지막 행만 읽기 비교')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help='시트당 행 수')
+    parser.add_argument('--empty-rows', type=int, default=0, help='데이터 뒤의 빈 격자 행 수')
+    parser.add_argument('--reads', type=int, default=10, help='위치를 기억한 상태에서 읽는 횟수')
+    args = parser.parse_args()
+
+    server = fake_sheets.serve(0, {}, args.empty_rows)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ['SHEETS_ENDPOINT'] = f"http://127.0.0.1:{server.server_address[1]}/"
+    import sheets  # SHEETS_ENDPOINT를 설정한 뒤에 불러옴
+
+    print(f"{'행 수':>8s} {'전체(ms)':>9s} {'전체(KB)':>9s} {'처음(ms)':>9s} {'이후(ms)':>9s} {'이후(KB)':>9s}")
+    for count in args.rows:
+        server.fake.sheets = fake_sheets.make_rows(count)
+        full_ms, full_bytes, cold_ms, warm_ms, tail_bytes = measure(sheets, server.fake, args.reads)
+        print(f"{count:8d} {full_ms * 1000:9.0f} {full_bytes / 1024:9.0f} {cold_ms * 1000:9.0f} "
+              f"{warm_ms * 1000:9.1f} {tail_bytes / 1024:9.0f}")
@@ -0,0 +1,107 @@
+"""
+Streamlit 화면(yen.py, dollar.py)의 시작 시간과 재실행 시간을 측정하는 스크립트
+
+새 프로세스에서 화면을 처음 실행할 때(콜드 스타트)와 같은 프로세스에서 다시 실행할 때(웜 재실행)를 나눠 측정함
+- 첫 화면: 프로세스 시작부터 화면 틀을 다 그리고 처음으로 데이터 작업을 기다리기 시작한 시점까지
+- 전체 실행: 스크립트 한 번이 끝날 때까지 (데이터 소스 응답 시간 포함)
+
+실행 예시:
+    python bench_startup.py                      # 가짜 Sheets 서버를 띄워서 측정
+    python bench_startup.py --runs 5 --reruns 10 yen.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+START = time.perf_counter()  # 다른 모듈을 불러오기 전에 기록
+
+ENTRY_POINTS = ['yen.py', 'dollar.py']
+
+
+def child(script, reruns, timeout):
+    # 새 프로세스 안에서 화면을 한 번 실행하고 재실행 시간을 측정한 결과를 JSON으로 출력
+    import fetcher
+
+    first_wait = []
+    original_result = fetcher.Job.result
+
+    def result(self):
+        if not first_wait:
+            first_wait.append(time.perf_counter())
+        return original_result(self)
+
+    fetcher.Job.result = result
+
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(script, default_timeout=timeout)
+    app.run()
+    cold_total = time.perf_counter() - START
+
+    warm = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        warm.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        'first_paint': (first_wait[0] - START) if first_wait else None,
+        'cold_total': cold_total,
+        'warm': warm,
+        'modules': len(sys.modules),
+        'errors': [element.value for element in app.error],
+    }))
+
+
+def run_child(script, reruns, timeout, env):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', '--reruns', str(reruns), '--timeout', str(timeout), script],
+        capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def start_fake_sheets():
+    import fake_sheets
+
+    server = fake_sheets.serve(0, fake_sheets.make_rows(1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def milliseconds(values):
+    values = [value for value in values if value is not None]
+    return f"{statistics.median(values) * 1000:8.0f}" if values else '       -'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Streamlit 화면 시작/재실행 시간 측정')
+    parser.add_argument('scripts', nargs='*', default=ENTRY_POINTS)
+    parser.add_argument('--runs', type=int, default=3, help='콜드 스타트 반복 횟수 (매번 새 프로세스)')
+    parser.add_argument('--reruns', type=int, default=5, help='프로세스마다 웜 재실행 횟수')
+    parser.add_argument('--timeout', type=float, default=60, help='스크립트 한 번의 제한 시간(초)')
+    parser.add_argument('--sheets-endpoint', default=None, help='사용할 Sheets 주소 (기본값: 가짜 Sheets 서버)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.scripts[0], args.reruns, args.timeout)
+        sys.exit(0)
+
+    env = dict(os.environ)
+    env['SHEETS_ENDPOINT'] = args.sheets_endpoint or env.get('SHEETS_ENDPOINT') or start_fake_sheets()
+
+    print(f"{'화면':12s} {'첫 화면(ms)':>10s} {'콜드 전체(ms)':>12s} {'웜 재실행(ms)':>12s} {'모듈 수':>7s}")
+    for script in args.scripts:
+        results = [run_child(script, args.reruns, args.timeout, env) for _ in range(args.runs)]
+        first_paint = milliseconds([result['first_paint'] for result in results])
+        cold_total = milliseconds([result['cold_total'] for result in results])
+        warm = milliseconds([value for result in results for value in result['warm']])
+        modules = statistics.median(result['modules'] for result in results)
+        print(f"{script:12s} {first_paint:>10s} {cold_total:>12s} {warm:>12s} {modules:7.0f}")
+        for error in {error for result in results for error in result['errors']}:
+            print(f"  오류 표시: {error}")
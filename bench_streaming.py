@@ -0,0 +1,109 @@
+"""
+스트리밍 지표(streaming.py)가 일괄 계산(indicators.sweep)과 같은 값을 내는지 확인하고 갱신 시간을 비교하는 스크립트
+
+실행 예시:
+    python bench_streaming.py                 # 가상 데이터로 확인 + 측정
+    python bench_streaming.py --steps 1000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import indicators
+from streaming import StreamingIndicators
+
+# (invert, precision, 환율 시세 기준값, 지수 기준값) - 엔화형과 달러형
+CASES = [
+    (True, 4, 0.11, 38000),
+    (False, 2, 1300, 104),
+]
+
+
+def make_history(quote_base, index_base, weeks=60, seed=1):
+    """
+    주말과 결측이 섞인 가상 시간봉 환율 / 일봉 지수를 만드는 함수
+    :return: tuple, (지수 일봉 종가, 환율 시간봉 종가)
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp('2026-10-16 05:00', tz='UTC')
+    hours = pd.date_range(end - pd.Timedelta(weeks=weeks), end, freq='h')
+    hours = hours[hours.dayofweek < 5]
+    hours = hours[rng.random(len(hours)) > 0.05]
+    days = pd.bdate_range((end - pd.Timedelta(weeks=weeks)).normalize(), end.normalize(), tz='UTC')
+    days = days[rng.random(len(days)) > 0.05]
+    quote = pd.Series(quote_base * np.exp(np.cumsum(rng.normal(0, 0.001, len(hours)))), index=hours).round(6)
+    index = pd.Series(index_base * np.exp(np.cumsum(rng.normal(0, 0.01, len(days)))), index=days).round(2)
+    return index, quote
+
+
+# 지수 단위로 반올림하는 지표 (나머지 실수 지표는 환율 자리수로 반올림)
+INDEX_KEYS = {'today_index', 'index_median', 'avg_index', 'avg_gap_ratio', 'index_gap_ratio', 'gap_ratio_new'}
+
+
+def compare(expected, actual, precision):
+    """
+    일괄 계산과 스트리밍 결과를 비교하는 함수
+    평균은 더하는 순서가 달라 마지막 자리에서 오차가 생기므로, 정확히 .5 경계에 걸린 값은 반올림이 한 단위 다를 수 있음
+    :return: str, 'same' (모두 같음), 'boundary' (반올림 한 단위 이내 차이), 'different' (그 밖의 차이)
+    """
+    numeric_differs, result = False, 'same'
+    for key, value in expected.items():
+        if value == actual[key] or isinstance(value, (bool, np.bool_, int, np.integer)):
+            continue
+        unit = 0.1 if key == 'index_gap_percentage' else 10 ** -(indicators.INDEX_PRECISION if key in INDEX_KEYS else precision)
+        if abs(float(value) - float(actual[key])) > unit + 1e-9:
+            return 'different'
+        numeric_differs, result = True, 'boundary'
+    if not numeric_differs and any(expected[key] != actual[key] for key in expected):
+        return 'different'  # 지표는 같은데 조건만 다른 경우
+    return result
+
+
+def replay(index, quote, weeks, invert, precision, steps):
+    """
+    마지막 steps개 시간봉을 하나씩 넣으면서 매번 일괄 계산과 비교하고 각각의 갱신 시간을 잰 결과를 반환하는 함수
+    :return: tuple, (반올림 경계 차이 수, 불일치 수, 일괄 계산 평균 ms, 스트리밍 평균 ms)
+    """
+    start = len(quote) - steps
+    streaming = StreamingIndicators.from_history(
+        index[index.index <= quote.index[start - 1]], quote.iloc[:start], weeks, invert, precision)
+    boundaries, mismatches, batch_time, stream_time = 0, 0, 0.0, 0.0
+    for k in range(start, len(quote)):
+        ts = quote.index[k]
+        now = ts + pd.Timedelta(minutes=1)
+
+        begin = time.perf_counter()
+        for session in index.index[(index.index > quote.index[k - 1]) & (index.index <= ts)]:
+            streaming.add_index(session, index[session])
+        streaming.add_quote(ts, quote.iloc[k])
+        actual = streaming.values(now)
+        stream_time += time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        expected = indicators.sweep(index[index.index <= ts], quote.iloc[:k + 1], [weeks], invert, precision, now=now)
+        batch_time += time.perf_counter() - begin
+
+        result = compare(expected.iloc[0].to_dict(), actual, precision)
+        boundaries += result == 'boundary'
+        mismatches += result == 'different'
+    return boundaries, mismatches, batch_time / steps * 1000, stream_time / steps * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='스트리밍 지표 확인 및 측정')
+    parser.add_argument('--steps', type=int, default=300, help='하나씩 넣어볼 시간봉 수')
+    parser.add_argument('--windows', type=int, nargs='+', default=[1, 4, 13, 52])
+    args = parser.parse_args()
+
+    print(f"{'invert':>6s} {'기간(주)':>7s} {'반올림 경계':>9s} {'불일치':>6s} {'일괄(ms)':>9s} {'스트리밍(ms)':>11s}")
+    failed = False
+    for invert, precision, quote_base, index_base in CASES:
+        index, quote = make_history(quote_base, index_base)
+        for weeks in args.windows:
+            boundaries, mismatches, batch_ms, stream_ms = replay(index, quote, weeks, invert, precision, args.steps)
+            failed = failed or mismatches > 0
+            print(f"{str(invert):>6s} {weeks:7d} {boundaries:9d} {mismatches:6d} {batch_ms:9.3f} {stream_ms:11.4f}")
+    if failed:
+        raise SystemExit("일괄 계산과 다른 값이 있습니다")
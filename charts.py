@@ -0,0 +1,89 @@
+"""
+차트에 보내는 점 수를 고정된 예산 이하로 줄이는 데이터 준비 단계
+
+- LTTB(Largest-Triangle-Three-Buckets): 구간마다 이웃 구간과 가장 큰 삼각형을 만드는 점 하나를 골라 모양(급등락)을 유지
+  (전체 최고점 / 최저점은 따로 남김)
+- 선택한 구간(window)만 다시 줄이므로, 구간을 좁히면 원래 해상도까지 확대됨
+- 같은 데이터 / 구간 / 예산의 결과는 캐시해서 재실행 때 다시 계산하지 않음
+"""
+import numpy as np
+import pandas as pd
+
+from market_cache import TTLCache
+
+# 차트 하나에 보내는 최대 점 수
+CHART_POINTS = 500
+
+# 줄인 결과를 재사용하는 시간(초) - 키에 데이터 지문이 들어가므로 데이터가 바뀌면 자동으로 새로 계산됨
+CHART_TTL = 10 * 60
+
+_cache = TTLCache(maxsize=32)
+
+
+def lttb_indices(x, y, threshold):
+    """
+    LTTB로 남길 점의 위치를 고르는 함수 (첫 점과 마지막 점은 항상 남김)
+    :param x: ndarray, 오름차순 x 값 (실수)
+    :param y: ndarray, y 값 (NaN은 고르지 않음)
+    :param threshold: int, 남길 점 수
+    :return: ndarray, 남길 점의 위치 (오름차순)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    every = (n - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1  # 가운데 구간들의 시작 위치
+    edges = np.append(edges, n - 1)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < threshold - 1 else n  # 마지막 구간의 다음은 마지막 점
+        next_x, next_y = x[end:next_end], y[end:next_end]
+        avg_x = next_x.mean()
+        avg_y = np.nanmean(next_y) if not np.isnan(next_y).all() else y[a]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        area = np.where(np.isnan(area), -1, area)
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def _fingerprint(frame):
+    return int(pd.util.hash_pandas_object(frame, index=False).sum())
+
+
+def prepare(frame, columns, x_column=None, window=None, budget=CHART_POINTS):
+    """
+    추세 데이터를 차트용으로 줄이는 함수
+    :param frame: DataFrame, 시간순 추세 데이터
+    :param columns: list, 차트에 그릴 컬럼 목록
+    :param x_column: str, x축 컬럼 (None이면 행 순서)
+    :param window: tuple, (시작, 끝) x 범위 - 이 구간만 그림 (None이면 전체)
+    :param budget: int, 최대 점 수 (컬럼마다 budget / 컬럼 수개씩 고른 점을 합침)
+    :return: DataFrame, x를 인덱스로 하고 columns를 컬럼으로 하는 줄인 데이터
+    """
+    key = (_fingerprint(frame[[x_column] + columns] if x_column else frame[columns]),
+           tuple(columns), x_column, window, budget)
+
+    def load():
+        data = frame[columns].copy()
+        data.index = frame[x_column].to_numpy() if x_column else np.arange(len(frame))
+        if window is not None:
+            data = data[(data.index >= window[0]) & (data.index <= window[1])]
+        if len(data) <= budget:
+            return data
+        x = data.index.to_numpy()
+        x = x.astype('datetime64[ns]').astype(np.int64).astype(float) if np.issubdtype(x.dtype, np.datetime64) \
+            else x.astype(float)
+        per_column = max(3, budget // len(columns) - 2)  # 최고점 / 최저점 자리를 남겨 예산을 넘지 않도록 함
+        picked = []
+        for column in columns:
+            y = data[column].to_numpy(dtype=float)
+            picked.append(lttb_indices(x, y, per_column))
+            if not np.isnan(y).all():
+                picked.append([np.nanargmin(y), np.nanargmax(y)])  # 전체 최고점 / 최저점은 항상 남김
+        return data.iloc[np.unique(np.concatenate(picked))]
+
+    return _cache.get_or_load(key, load, CHART_TTL).copy()
@@ -0,0 +1,79 @@
+"""
+적정환율을 주기적으로 계산해서 로컬 저장소(estimate_store)에 쌓는 수집기
+
+실행 예시:
+    python collector.py                # 한 시간마다 계속 수집
+    python collector.py --once         # 한 번만 수집 (cron 등 외부 스케줄러용)
+"""
+import argparse
+import logging
+import time
+
+import estimate_store
+import pairs
+
+logger = logging.getLogger('collector')
+
+
+def collect(names, weeks=4, store=None):
+    """
+    여러 통화쌍의 지표를 한 번의 묶음 다운로드로 계산해서 저장하는 함수 (화면과 같은 pairs.evaluate 계산)
+    :param names: list, 통화쌍 이름 목록 (pairs.PAIRS의 키)
+    :param weeks: int, 분석 기간(주)
+    :param store: EstimateStore, 저장소 (기본값: 프로세스 전역 저장소)
+    :return: dict, 통화쌍 이름 -> PairResult 또는 예외 객체
+    """
+    specs = [pairs.PAIRS[name]._replace(weeks=weeks) for name in names]
+    results = pairs.evaluate(specs)
+    store = store or estimate_store.get_store()
+    for name, result in results.items():
+        if not isinstance(result, Exception):
+            # 화면의 기간별 비교 표도 수집 기록으로 그릴 수 있도록 모든 분석 기간의 지표를 같은 봉 시각으로 저장
+            for window in result.sweep.index:
+                store.append(name, int(window), result.ts, result.sweep.loc[window].to_dict())
+            store.append(name, weeks, result.ts, result.values)
+    return results
+
+
+def collect_all(names, weeks=4):
+    """
+    여러 통화쌍을 수집하는 함수 (한 통화쌍이 실패해도 나머지는 계속 수집)
+    :param names: list, 통화쌍 이름 목록
+    :param weeks: int, 분석 기간(주)
+    """
+    try:
+        results = collect(names, weeks)
+    except Exception:
+        logger.exception("시세 데이터를 다운로드하는 도중 오류가 발생했습니다")
+        return
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            logger.error("%s 수집 도중 오류가 발생했습니다: %s", name, result)
+        else:
+            logger.info("%s 수집 완료: 현재 %s / 적정 %s", name, result.values['today_fx'], result.values['estimate'])
+
+
+def run_forever(names, weeks=4, interval=3600):
+    """
+    interval초 간격(정각 기준)으로 계속 수집하는 함수
+    :param interval: int, 수집 간격(초)
+    """
+    while True:
+        collect_all(names, weeks)
+        now = time.time()
+        time.sleep(interval - now % interval)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='적정환율 수집기')
+    parser.add_argument('--pairs', nargs='+', choices=sorted(pairs.PAIRS), default=sorted(pairs.PAIRS))
+    parser.add_argument('--weeks', type=int, default=4, help='분석 기간(주)')
+    parser.add_argument('--interval', type=int, default=3600, help='수집 간격(초)')
+    parser.add_argument('--once', action='store_true', help='한 번만 수집하고 종료')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.once:
+        collect_all(args.pairs, args.weeks)
+    else:
+        run_forever(args.pairs, args.weeks, args.interval)
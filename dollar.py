@@ -1,14 +1,34 @@
 import os
-from datetime import datetime, timedelta
-import yfinance as yf
-import pytz
-import numpy as np
+
 import streamlit as st
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-import pandas as pd
-import requests
-from lxml import etree
+
+import fetcher
+import pair_view
+
+# 무거운 모듈(pandas, yfinance, 구글 클라이언트 등)은 작업 스레드에서 처음 쓸 때 불러옴
+# 작업은 'module:function' 이름으로 넘겨서 화면 틀이 import를 기다리지 않고 바로 그려지도록 함
+
+
+SHEET_NAMES = ['usd_trend', 'usd_history']
+
+# 이 화면에서 보여줄 통화쌍 (pairs.PAIRS의 키)
+PAIR_NAMES = ['usd']
+
+
+# 실시간 모드 기본값 (켜면 프로세스 하나의 생산자가 받은 최신 시세를 모든 세션이 나눠 봄, live.py)
+LIVE_MODE = os.environ.get('LIVE_MODE', '0') == '1'
+
+# 추세 데이터 출처 ('sheets': 구글 스프레드시트, 'local': 수집기(collector.py)가 쌓은 로컬 저장소)
+TREND_SOURCE = os.environ.get('TREND_SOURCE', 'sheets')
+read_trend_frames = 'estimate_store:read_frames' if TREND_SOURCE == 'local' else 'sheets:read_frames'
+
+# 서로 독립적인 I/O를 한꺼번에 시작 (페이지 지연 시간이 합이 아니라 가장 느린 소스 하나로 제한됨)
+jobs = fetcher.start({
+    'sheets': ('sheets', read_trend_frames, SHEET_NAMES),  # 두 범위를 한 번의 batchGet으로 읽음
+    'snapshots': ('estimate_store', 'estimate_store:load_snapshots', PAIR_NAMES),
+})
+
+live_mode = st.sidebar.toggle("실시간 모드", value=LIVE_MODE)
 
 tab1, tab2 = st.tabs(["달러", "차트분석"])
 
@@ -16,138 +36,23 @@ tab1, tab2 = st.tabs(["달러", "차트분석"])
 with tab1:
     st.title('원달러환율 적정환율 데이터')
 
-    def download_data_usd(period_weeks, period_hours):
-        start = datetime.today() - timedelta(weeks=period_weeks)
-        end = datetime.today()
-
-        try:
-            usd_index_data = yf.download('DX-Y.NYB', start=start, end=end)
-        except Exception as e:
-            st.error(f"USD Index 데이터를 다운로드하는 도중 오류가 발생했습니다: {e}")
-            return None, None, None
-
-        try:
-            usd_krw_data = yf.download('USDKRW=X', start=start, end=end, interval='1h')
-        except Exception as e:
-            st.error(f"USD/KRW 데이터를 다운로드하는 도중 오류가 발생했습니다: {e}")
-            return usd_index_data, None, None
-
-        usd_index_data.index = usd_index_data.index.tz_localize('UTC')
-        usd_krw_data.index = usd_krw_data.index.tz_convert('UTC')
-
-        now = datetime.now(pytz.utc)
-        last_24_hours_data_usd = usd_krw_data[usd_krw_data.index >= (now - timedelta(hours=period_hours))]
-
-        return usd_index_data, usd_krw_data, last_24_hours_data_usd
-
-    def calculate_indicators_usd(usd_index_data, usd_krw_data):
-        today_usd_index = round(float(usd_index_data['Close'].iloc[-1]), 2)
-        today_usd_krw = round(float(usd_krw_data['Close'].iloc[-1]), 2)
-        usd_index_median = round(float(usd_index_data['Close'].median()), 2)
-        usd_krw_median = round(float(usd_krw_data['Close'].median()), 2)
-        usd_gap_ratio = round((today_usd_index / usd_index_median) * 100, 2)
-        avg_usd_gap_ratio = round((usd_index_data['Close'] / usd_krw_data['Close']).mean() * 100, 2)
-        avg_usd_index = round(float(usd_index_data['Close'].mean()), 2)
-        avg_usd_krw = round(float(usd_krw_data['Close'].mean()), 2)
-        usd_krw_estimate = round((today_usd_index / avg_usd_gap_ratio) * 100, 2)
-        usd_gap_percentage = round(((today_usd_index - usd_index_median) / usd_index_median) * 100, 1)
-        usd_gap_ratio_new = round((today_usd_index / usd_krw_median) * 100, 2)
-
-        return {
-            'today_usd_index': today_usd_index,
-            'today_usd_krw': today_usd_krw,
-            'usd_index_median': usd_index_median,
-            'usd_krw_median': usd_krw_median,
-            'usd_gap_ratio': usd_gap_ratio,
-            'avg_usd_gap_ratio': avg_usd_gap_ratio,
-            'avg_usd_index': avg_usd_index,
-            'avg_usd_krw': avg_usd_krw,
-            'usd_krw_estimate': usd_krw_estimate,
-            'usd_gap_percentage': usd_gap_percentage,
-            'usd_gap_ratio_new': usd_gap_ratio_new
-        }
-
-    def check_conditions_usd(indicators):
-        condition1 = indicators['today_usd_krw'] < indicators['avg_usd_krw']
-        condition2 = indicators['today_usd_index'] < indicators['avg_usd_index']
-        condition3 = indicators['usd_gap_ratio_new'] > indicators['avg_usd_gap_ratio']
-        condition4 = indicators['today_usd_krw'] < indicators['usd_krw_estimate']
-        return condition1, condition2, condition3, condition4
-
-    def calculate_exchange_rate_usd(period_weeks, period_hours=24):
-        usd_index_data, usd_krw_data, last_24_hours_data_usd = download_data_usd(period_weeks, period_hours)
-        
-        if usd_index_data is None or usd_krw_data is None:
-            return
-
-        indicators = calculate_indicators_usd(usd_index_data, usd_krw_data)
-        
-        conditions = check_conditions_usd(indicators)
-        suitable_conditions = sum(conditions)
-        
-        today_usd_krw = indicators['today_usd_krw']
-        usd_krw_estimate = indicators['usd_krw_estimate']
-        delta_usd = round(today_usd_krw - usd_krw_estimate, 2)
-        is_fair_value_usd = today_usd_krw < usd_krw_estimate
-        
-        emoji_usd = "☀️" if is_fair_value_usd else "🌧️"
-        status_text_usd = "적정환율" if is_fair_value_usd else "과대평가"
-        
-        st.metric(label=f"야후파이낸스기준 현재: {today_usd_krw} 원", value=f"{emoji_usd}", delta=f"{delta_usd} 원")
-        st.write(f"현재 USD/KRW 환율은 {usd_krw_estimate} 원의 적정환율과 비교하여 {status_text_usd}되어 있습니다.")
-        
-        condition_labels_usd = [
-            '조건1 (현재 USD/KRW 환율 < 4주 평균 환율)',
-            '조건2 (현재 USD 인덱스 < 4주 평균 USD 인덱스)',
-            '조건3 (현재 USD 갭 비율 > 4주 평균 USD 갭 비율)',
-            '조건4 (현재 USD/KRW 환율 < 적정 USD/KRW 환율)'
-        ]
-        
-        for label, condition in zip(condition_labels_usd, conditions):
-            condition_status = "✅" if condition else "❌"
-            st.write(f"{label}: {condition_status}")
-
-    calculate_exchange_rate_usd(4)
-
-    # 추세 그래프 데이터 가져오기
-    SERVICE_ACCOUNT_FILE = 'dollainvestingtool-1a7b13d623dd.json'
-
-    SPREADSHEET_ID = '1iw-NdSsOOg63Q3dOQWVdY6FzW1fOuYGkIuX1Wx-wy0Q'
-    RANGE_NAME_USD = '달러_4주!A2:F'
-
-    RANGE_NAME_USD_a = '달러_4주_환율만!A2:F'
-
-    SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
-
-    creds = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-
-    service = build('sheets', 'v4', credentials=creds)
-
-    result_usd_a = service.spreadsheets().values().get(spreadsheetId=SPREADSHEET_ID, range=RANGE_NAME_USD_a).execute()
-    rows_usd_a = result_usd_a.get('values', [])
-
-    df_usd_a = pd.DataFrame(rows_usd_a, columns=['적정원달러환율', '현재원달러환율'])
-    df_usd_a = df_usd_a[['적정원달러환율', '현재원달러환율']]
-
-    df_usd_a = df_usd_a.iloc[::-1].head(24).reset_index(drop=True)
-
-    st.write('24시간추세')
-    st.scatter_chart(df_usd_a)
-
-    result_usd = service.spreadsheets().values().get(spreadsheetId=SPREADSHEET_ID, range=RANGE_NAME_USD).execute()
-    rows_usd = result_usd.get('values', [])
-
-    df_usd = pd.DataFrame(rows_usd, columns=['현재날짜', '기간', '적정원달러', None, None, '현재원달러환율'])
-    df_usd = df_usd[['현재날짜', '적정원달러', '현재원달러환율']]
-
-    # df_usd['현재날짜'] = pd.to_datetime(df_usd['현재날짜']).dt.strftime('%m/%d %H 시')
-
-    df_usd = df_usd.iloc[::-1].head(24).reset_index(drop=True)
-
-    st.table(df_usd)
-
-
-    
+    # 수집기(collector.py)가 최근에 기록한 통화쌍은 다운로드 / 계산 작업을 시작하지 않음 (보는 사람 수와 무관한 계산량)
+    snapshots = pair_view.wait_snapshots(jobs['snapshots'])
+    compute_names = pair_view.pairs_to_compute(PAIR_NAMES, snapshots)
+    if compute_names:
+        jobs.update(fetcher.start({'pairs': ('yahoo', 'pairs:evaluate', compute_names)}))
+
+    # 4주 기준 지표와 기간별 비교
+    results = pair_view.wait_results(jobs.get('pairs'))
+    pair_view.show_pair('usd', results, live_mode, snapshots)
+
+    # 추세 그래프와 최근 기록 표 (미리 시작한 작업의 결과를 기다림, yen.py의 달러 탭과 같은 화면)
+    frames = pair_view.wait_frames(jobs['sheets'], SHEET_NAMES)
+    pair_view.show_usd_trend(frames)
+
+
+# PROFILE_STAGES=1이면 단계별 실행 시간을 사이드바에 표시
+pair_view.show_timings(jobs)
+
 # with tab3:
 #     st.title('금시세 데이터')
\ No newline at end of file
@@ -0,0 +1,183 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import pandas as pd
+
+import indicators
+import pairs
+import sheets
+
+# 수집기(collector.py)가 계산한 적정환율을 쌓아두는 로컬 파일
+ESTIMATE_STORE_PATH = os.environ.get('ESTIMATE_STORE_PATH', 'estimates.sqlite3')
+
+# 이 시간(초)보다 오래전에 수집된 값은 화면에서 쓰지 않고 직접 계산함
+MAX_SNAPSHOT_AGE = 2 * 60 * 60
+
+# 수집 경과 시간이 이보다 짧으면 화면에서 다운로드 / 계산 작업을 시작하지 않고 수집된 값만 씀 (수집 간격 한 시간에 여유를 둠)
+FRESH_SNAPSHOT_AGE = int(os.environ.get('FRESH_SNAPSHOT_AGE', 65 * 60))
+
+# 추세 화면에 넘겨줄 최대 행 수 (시트 파서가 변환하는 행 수와 같음)
+MAX_TREND_ROWS = sheets.TREND_ROWS
+
+# 추세 데이터 이름 -> 통화쌍 이름
+TREND_PAIRS = {
+    'jpy_trend': 'jpy',
+    'jpy_history': 'jpy',
+    'usd_trend': 'usd',
+    'usd_history': 'usd',
+}
+
+# 화면에 넘겨줄 수집기 기록 - PairResult, 수집 시각(time.time 기준), 이 시각까지는 화면에서 직접 계산하지 않음
+Snapshot = namedtuple('Snapshot', ['result', 'collected_at', 'fresh_until'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS estimates (
+    pair TEXT NOT NULL,
+    weeks INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    collected_at INTEGER NOT NULL,
+    today_fx REAL,
+    estimate REAL,
+    suitable_conditions INTEGER,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (pair, weeks, ts)
+);
+"""
+
+
+class EstimateStore:
+    """
+    통화쌍/분석 기간별로 수집 시점의 지표를 시계열로 저장하는 저장소
+    """
+
+    def __init__(self, path):
+        """
+        :param path: str, SQLite 파일 경로
+        """
+        self.path = path
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')  # 수집기가 쓰는 동안에도 화면에서 읽을 수 있도록 함
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def append(self, pair, weeks, ts, values):
+        """
+        수집한 지표 한 건을 저장하는 함수 (같은 봉 시각은 새 값으로 덮어씀)
+        :param pair: str, 통화쌍 이름
+        :param weeks: int, 분석 기간(주)
+        :param ts: Timestamp, 지표를 계산한 마지막 환율 봉 시각
+        :param values: dict, 지표 이름 -> 값 (indicators.sweep 결과의 한 행 또는 PairResult.values)
+        """
+        payload = {key: value.item() if hasattr(value, 'item') else value for key, value in values.items()}
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO estimates VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (pair, weeks, int(pd.Timestamp(ts).timestamp()), int(time.time()),
+                 payload['today_fx'], payload['estimate'], payload['suitable_conditions'], json.dumps(payload)))
+
+    def snapshot(self, pair, weeks, windows, max_age=MAX_SNAPSHOT_AGE):
+        """
+        가장 최근에 수집된 지표와 같은 봉 시각의 기간별 지표 표를 함께 반환하는 함수
+        :param weeks: int, 현재 지표의 분석 기간(주)
+        :param windows: list, 기간별 비교 표에 넣을 분석 기간(주) 목록
+        :param max_age: float, 허용하는 수집 경과 시간(초)
+        :return: tuple 또는 None, (PairResult, 수집 시각(time.time 기준)) - 충분히 최근 값이 없거나 기간이 빠져 있으면 None
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT ts, collected_at FROM estimates WHERE pair = ? AND weeks = ? ORDER BY ts DESC LIMIT 1',
+                (pair, weeks)).fetchone()
+            if row is None or time.time() - row[1] > max_age:
+                return None
+            rows = conn.execute('SELECT weeks, payload FROM estimates WHERE pair = ? AND ts = ?', (pair, row[0])).fetchall()
+        payloads = {row_weeks: json.loads(payload) for row_weeks, payload in rows}
+        if any(window not in payloads for window in [weeks, *windows]):
+            return None
+        sweep = pd.DataFrame([payloads[window] for window in windows], index=pd.Index(list(windows), name='weeks'))
+        return pairs.PairResult(payloads[weeks], sweep, pd.Timestamp(row[0], unit='s', tz='UTC')), row[1]
+
+    def read(self, pair, weeks, limit=MAX_TREND_ROWS):
+        """
+        최근 수집된 지표를 시간순으로 읽는 함수
+        :param limit: int, 최대 행 수
+        :return: DataFrame, ts(UTC), today_fx, estimate 컬럼
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT ts, today_fx, estimate FROM estimates WHERE pair = ? AND weeks = ? ORDER BY ts DESC LIMIT ?',
+                (pair, weeks, limit)).fetchall()
+        data = pd.DataFrame(rows[::-1], columns=['ts', 'today_fx', 'estimate'])
+        data['ts'] = pd.to_datetime(data['ts'], unit='s', utc=True)
+        return data
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    프로세스 전역 지표 저장소를 반환하는 함수
+    :return: EstimateStore, 지표 저장소
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EstimateStore(ESTIMATE_STORE_PATH)
+    return _store
+
+
+def load_snapshots(names):
+    """
+    수집기가 최근에 기록해 둔 통화쌍별 지표와 기간별 지표 표를 반환하는 함수 (화면에서는 작업 스레드로 실행)
+    :param names: list, 통화쌍 이름 목록 (pairs.PAIRS의 키)
+    :return: dict, 통화쌍 이름 -> Snapshot (최근 기록이 없는 통화쌍은 빠짐)
+    """
+    store = get_store()
+    snapshots = {}
+    for name in names:
+        snapshot = store.snapshot(name, pairs.PAIRS[name].weeks, indicators.WINDOWS)
+        if snapshot is not None:
+            result, collected_at = snapshot
+            snapshots[name] = Snapshot(result, collected_at, collected_at + FRESH_SNAPSHOT_AGE)
+    return snapshots
+
+
+def _sheet_rows(name, data, weeks):
+    # 외부 시트 기록기가 쓰던 것과 같은 행 형태로 바꿔서 시트 파서를 그대로 사용 (숫자는 숫자 그대로 넘김)
+    dates = data['ts'].dt.tz_convert('Asia/Seoul').dt.strftime(sheets.DATE_FORMAT)
+    estimate = data['estimate']
+    today_fx = data['today_fx']
+    if name == 'jpy_trend':
+        return [list(row) for row in zip(dates, estimate, today_fx)]
+    if name == 'usd_trend':
+        return [list(row) for row in zip(estimate, today_fx)]
+    return [[date, f'{weeks}주', est, '', '', fx] for date, est, fx in zip(dates, estimate, today_fx)]
+
+
+def read_frames(names, weeks=4):
+    """
+    수집기가 쌓은 지표를 스프레드시트 추세 데이터와 같은 형태의 데이터프레임으로 반환하는 함수
+    :param names: list, 데이터 이름 목록 (sheets.RANGES의 키)
+    :param weeks: int, 분석 기간(주)
+    :return: dict, 데이터 이름 -> DataFrame
+    """
+    store = get_store()
+    frames = {}
+    for name in names:
+        data = store.read(TREND_PAIRS[name], weeks, sheets.TAIL_ROWS[name])
+        frames[name] = sheets.parse(name, _sheet_rows(name, data, weeks))
+    return frames
@@ -0,0 +1,145 @@
+"""
+로컬 가짜 Sheets API 서버 (values.get / values.batchGet / 시트 격자 크기 조회만 지원)
+
+실행 예시:
+    python fake_sheets.py --port 8765 --rows 1000
+    SHEETS_ENDPOINT=http://localhost:8765/ streamlit run yen.py
+"""
+import argparse
+import json
+import re
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+_RANGE_PATTERN = re.compile(r'^(?P<sheet>[^!]+)!(?P<col1>[A-Z]+)(?P<row1>\d+)(?::(?P<col2>[A-Z]+)(?P<row2>\d*))?$')
+
+
+def _column_index(letters):
+    index = 0
+    for letter in letters:
+        index = index * 26 + (ord(letter) - ord('A') + 1)
+    return index - 1
+
+
+def parse_range(range_name):
+    """
+    A1 표기 범위를 나누는 함수
+    :param range_name: str, 스프레드시트 범위 (예: '엔_4주!A2:F', '엔_4주!A10:F20')
+    :return: tuple, (시트 이름, 첫 행, 마지막 행 또는 None, 첫 열, 마지막 열)
+    :raises KeyError: 지원하지 않는 형식인 경우
+    """
+    match = _RANGE_PATTERN.match(range_name)
+    if match is None:
+        raise KeyError(range_name)
+    last_row = int(match['row2']) if match['row2'] else None
+    return match['sheet'], int(match['row1']), last_row, match['col1'], match['col2'] or match['col1']
+
+
+def make_rows(count, start=None):
+    """
+    네 개의 시트에 들어갈 시간 단위 가짜 데이터를 만드는 함수
+    :param count: int, 시트당 행 수
+    :param start: datetime, 첫 행의 시각 (기본값: 지금으로부터 count시간 전)
+    :return: dict, 시트 이름 -> 행 목록 (첫 행은 머리글)
+    """
+    start = start or datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=count)
+    sheets = {name: [['header']] for name in ['엔_4주', '엔_4주_환율만', '달러_4주', '달러_4주_환율만']}
+    for i in range(count):
+        date = (start + timedelta(hours=i)).strftime('%Y-%m-%d %H:%M:%S')
+        jpy_estimate, jpy_now = f"{9.10 + (i % 50) * 0.001:.4f}", f"{9.05 + (i % 70) * 0.001:.4f}"
+        usd_estimate, usd_now = f"{1350 + (i % 40) * 0.5:.2f}", f"{1345 + (i % 60) * 0.5:.2f}"
+        sheets['엔_4주'].append([date, '4주', jpy_estimate, '', '', jpy_now])
+        sheets['엔_4주_환율만'].append([date, jpy_estimate, jpy_now])
+        sheets['달러_4주'].append([date, '4주', usd_estimate, '', '', usd_now])
+        sheets['달러_4주_환율만'].append([usd_estimate, usd_now])
+    return sheets
+
+
+class FakeSheets:
+    """
+    시트 이름 -> 행 목록을 메모리에 들고 범위 요청에 응답하는 가짜 스프레드시트
+    """
+
+    def __init__(self, sheets, empty_rows=0):
+        """
+        :param sheets: dict, 시트 이름 -> 행 목록
+        :param empty_rows: int, 데이터 뒤에 붙은 빈 격자 행 수 (실제 시트처럼 격자가 데이터보다 클 때를 흉내 냄)
+        """
+        self.sheets = sheets
+        self.empty_rows = empty_rows
+
+    def metadata(self):
+        return {'sheets': [
+            {'properties': {'title': name, 'gridProperties': {'rowCount': len(rows) + self.empty_rows}}}
+            for name, rows in self.sheets.items()]}
+
+    def get(self, range_name):
+        sheet, first, last, first_column, last_column = parse_range(range_name)
+        if sheet not in self.sheets:
+            raise KeyError(range_name)
+        rows = self.sheets[sheet]
+        first -= 1
+        last = last or len(rows)
+        col_first = _column_index(first_column)
+        col_last = _column_index(last_column) + 1
+        values = [row[col_first:col_last] for row in rows[first:last]]
+        return {'range': range_name, 'majorDimension': 'ROWS', 'values': values}
+
+
+def make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            path = unquote(parsed.path)
+            try:
+                if path.endswith('/values:batchGet'):
+                    body = {'valueRanges': [fake.get(name) for name in query.get('ranges', [])]}
+                elif '/values/' in path:
+                    body = fake.get(path.split('/values/', 1)[1])
+                elif path.rstrip('/').rsplit('/', 2)[-2] == 'spreadsheets':
+                    body = fake.metadata()
+                else:
+                    self.send_error(404)
+                    return
+            except KeyError as e:
+                self.send_error(400, f"잘못된 범위: {e}")
+                return
+            payload = json.dumps(body, ensure_ascii=False).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=UTF-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass  # 부하 측정 시 로그 출력 비용을 없앰
+
+    return Handler
+
+
+def serve(port, sheets, empty_rows=0):
+    """
+    가짜 Sheets 서버를 만드는 함수 (호출한 쪽에서 serve_forever 실행)
+    :param port: int, 포트 번호 (0이면 빈 포트 자동 선택)
+    :param sheets: dict, 시트 이름 -> 행 목록
+    :param empty_rows: int, 데이터 뒤에 붙은 빈 격자 행 수
+    :return: ThreadingHTTPServer, 서버 객체 (fake 속성으로 시트 내용을 바꿀 수 있음)
+    """
+    fake = FakeSheets(sheets, empty_rows)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(fake))
+    server.fake = fake
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='로컬 가짜 Sheets API 서버')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rows', type=int, default=1000, help='시트당 행 수')
+    parser.add_argument('--empty-rows', type=int, default=0, help='데이터 뒤의 빈 격자 행 수')
+    args = parser.parse_args()
+
+    server = serve(args.port, make_rows(args.rows), args.empty_rows)
+    print(f"가짜 Sheets 서버 실행 중: http://127.0.0.1:{args.port}/ (시트당 {args.rows}행)")
+    server.serve_forever()
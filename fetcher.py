@@ -0,0 +1,262 @@
+import importlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import profiling
+
+# 소스별 응답 제한 시간(초)
+TIMEOUTS = {
+    'investing': 10,
+    'yahoo': 30,
+    'sheets': 15,
+    'estimate_store': 5,  # 로컬 파일이라 오래 걸리면 기다리지 않고 직접 계산함
+}
+DEFAULT_TIMEOUT = 30
+
+# 연속 실패(오류 또는 제한 시간 초과)가 이만큼 쌓이면 회로를 열어 해당 소스 요청을 잠시 멈춤
+FAILURE_THRESHOLD = 3
+
+# 회로가 열린 뒤 다시 한 번 시도해 보기까지 기다리는 시간(초) - 다시 실패하면 두 배씩 늘림
+RETRY_BACKOFF = 5
+MAX_RETRY_BACKOFF = 300
+
+# 이전에 받아 둔 결과가 있을 때 제출 후 새 결과를 기다리는 최대 시간(초) - 넘으면 이전 결과를 먼저 보여주고 작업은 계속 진행
+# 함께 시작한 작업들은 이 시간을 나눠 씀 (작업마다 따로 기다리지 않음)
+STALE_WAIT = 2
+
+# 모든 세션이 함께 쓰는 작업 스레드 풀 (제한 시간을 넘긴 작업이 다음 요청을 막지 않도록 넉넉하게 둠)
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='fetch')
+
+
+class CircuitOpenError(Exception):
+    """
+    회로가 열려 있어 소스에 요청하지 않은 경우
+    """
+
+
+class PartialResultError(Exception):
+    """
+    항목별 결과(pairs.evaluate의 통화쌍별 결과 등) 중 일부가 예외 객체인 경우
+    """
+
+    def __init__(self, results):
+        """
+        :param results: dict, 항목 이름 -> 결과 또는 예외 객체
+        """
+        failed = [str(name) for name, value in results.items() if isinstance(value, Exception)]
+        super().__init__(f"{', '.join(failed)} 결과를 받지 못했습니다")
+        self.results = results
+
+
+def _merge(results, previous):
+    # 실패한 항목만 이전 결과로 채움
+    return {name: previous.get(name, value) if isinstance(value, Exception) else value
+            for name, value in results.items()}
+
+
+class Breaker:
+    """
+    소스 하나의 회로 차단기
+    연속 실패가 FAILURE_THRESHOLD번 쌓이면 열리고, 열려 있는 동안에는 요청을 바로 실패시킴
+    대기 시간이 지나면 요청 하나만 시험 삼아 보내서(half-open) 성공하면 닫고, 실패하면 대기 시간을 두 배로 늘림
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.failures = 0
+        self.backoff = RETRY_BACKOFF
+        self.opened_until = 0.0  # 다음 시험 요청을 보낼 수 있는 시각 (monotonic)
+        self.probe_started = None  # 진행 중인 시험 요청의 시작 시각
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.failures >= FAILURE_THRESHOLD
+
+    def allow(self):
+        """
+        요청을 보내도 되는지 확인하는 함수 (열려 있을 때는 대기 시간이 지난 요청 하나만 허용)
+        :return: bool, 요청 허용 여부
+        """
+        with self._lock:
+            if not self.is_open:
+                return True
+            now = time.monotonic()
+            if now < self.opened_until:
+                return False
+            timeout = TIMEOUTS.get(self.source, DEFAULT_TIMEOUT)
+            if self.probe_started is not None and now - self.probe_started < timeout:
+                return False  # 다른 세션의 시험 요청이 아직 진행 중
+            self.probe_started = now
+            return True
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.backoff = RETRY_BACKOFF
+            self.probe_started = None
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probe_started = None
+            if self.is_open:
+                self.opened_until = time.monotonic() + self.backoff
+                self.backoff = min(self.backoff * 2, MAX_RETRY_BACKOFF)
+
+    def retry_in(self):
+        # 다음 시험 요청까지 남은 시간(초)
+        return max(0.0, self.opened_until - time.monotonic())
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+# 작업 키 -> (마지막 성공 결과, 받은 시각(time.time())) - 소스가 느리거나 실패할 때 대신 보여줌
+_last_good = {}
+_last_good_lock = threading.Lock()
+
+
+def get_breaker(source):
+    """
+    소스의 회로 차단기를 반환하는 함수 (프로세스 전체에서 소스마다 하나)
+    :param source: str, 데이터 소스 이름 (TIMEOUTS의 키)
+    :return: Breaker, 회로 차단기
+    """
+    with _breakers_lock:
+        if source not in _breakers:
+            _breakers[source] = Breaker(source)
+        return _breakers[source]
+
+
+def _job_key(source, fn, args, kwargs):
+    name = fn if isinstance(fn, str) else f'{fn.__module__}:{getattr(fn, "__qualname__", fn)}'
+    return source, name, repr(args), repr(sorted(kwargs.items()))
+
+
+class Job:
+    """
+    백그라운드에서 실행 중인 I/O 작업 하나 (제출 시점부터 소스별 제한 시간이 흐름)
+    """
+
+    def __init__(self, name, source, future, timings=None, key=None):
+        self.name = name
+        self.source = source
+        self.future = future
+        self.timings = timings  # 작업 스레드에서 기록된 (단계 이름, 실행 시간(초)) 목록 (PROFILE_STAGES=1일 때만)
+        self.key = key
+        submitted = time.monotonic()
+        self.deadline = submitted + TIMEOUTS.get(source, DEFAULT_TIMEOUT)
+        self.stale_deadline = submitted + STALE_WAIT  # 이전 결과가 있을 때 새 결과를 기다리는 기한
+        self.stale_since = None  # 이전 결과를 대신 반환했으면 그 결과를 받은 시각 (time.time())
+        self.stale_reason = None  # 이전 결과를 대신 반환한 이유
+        self._timed_out = False
+
+    def result(self):
+        """
+        작업 결과를 기다려 반환하는 함수
+        이전에 받아 둔 결과가 있으면 제출 후 STALE_WAIT까지만 기다리고, 실패하거나 늦으면 이전 결과를 반환함 (stale_since 설정)
+        소스가 최근에 실패했으면(회로가 열렸거나 연속 실패 중) 기다리지 않고 이전 결과를 바로 반환함
+        :return: object, 작업 결과
+        :raises TimeoutError: 제한 시간 안에 끝나지 않았고 이전 결과도 없는 경우
+        :raises CircuitOpenError: 회로가 열려 있고 이전 결과도 없는 경우
+        :raises Exception: 작업에서 발생한 예외 (이전 결과가 없는 경우)
+        일부 항목만 실패한 결과(PartialResultError)는 실패한 항목만 이전 결과로 채워 반환함 (이전 결과가 없으면 그대로 반환)
+        """
+        with _last_good_lock:
+            stale = _last_good.get(self.key)
+        now = time.monotonic()
+        remaining = max(0, self.deadline - now)
+        wait = remaining
+        if stale is not None:
+            wait = 0 if get_breaker(self.source).failures else min(remaining, max(0, self.stale_deadline - now))
+        try:
+            return self.future.result(timeout=wait)
+        except FutureTimeoutError as e:
+            if self.future.done():
+                error = e  # 작업 자체에서 발생한 TimeoutError
+            elif wait < remaining:
+                error = TimeoutError(f"{self.name} 새 데이터를 아직 받는 중입니다")
+            else:
+                if not self._timed_out:
+                    self._timed_out = True
+                    get_breaker(self.source).failure()  # 멈춰 있는 요청도 실패로 셈
+                error = TimeoutError(
+                    f"{self.name} 응답 시간({TIMEOUTS.get(self.source, DEFAULT_TIMEOUT)}초)을 초과했습니다")
+        except Exception as e:
+            error = e
+        if stale is None:
+            if isinstance(error, PartialResultError):
+                return error.results  # 이전 결과가 없으면 성공한 항목만이라도 반환
+            raise error
+        self.stale_since, self.stale_reason = stale[1], error
+        if isinstance(error, PartialResultError):
+            return _merge(error.results, stale[0])
+        return stale[0]
+
+
+def _run(fn, *args, **kwargs):
+    # 'module:function' 형태면 작업 스레드에서 모듈을 불러옴 (무거운 모듈 import가 화면 그리기를 막지 않도록 함)
+    if isinstance(fn, str):
+        module_name, _, attribute = fn.partition(':')
+        fn = getattr(importlib.import_module(module_name), attribute)
+    return fn(*args, **kwargs)
+
+
+def _guarded(key, fn, *args, **kwargs):
+    # 결과를 회로 차단기에 알리고, 성공한 결과는 다음 장애 때 대신 보여줄 수 있도록 기억
+    breaker = get_breaker(key[0])
+    try:
+        value = _run(fn, *args, **kwargs)
+    except Exception:
+        breaker.failure()
+        raise
+    if isinstance(value, dict) and any(isinstance(item, Exception) for item in value.values()):
+        # 일부 항목이 실패한 결과도 실패로 셈 - 이전 결과의 해당 항목은 지우지 않고 남겨 둠 (받은 시각은 그대로)
+        breaker.failure()
+        with _last_good_lock:
+            previous = _last_good.get(key)
+            if previous is not None:
+                _last_good[key] = (_merge(value, previous[0]), previous[1])
+        raise PartialResultError(value)
+    breaker.success()
+    with _last_good_lock:
+        _last_good[key] = (value, time.time())
+    return value
+
+
+def _traced(timings, name, key, fn, *args, **kwargs):
+    # 작업 스레드에서 기록되는 단계 시간을 작업별 목록에 모음
+    with profiling.collect(timings), profiling.stage(f'job {name}'):
+        return _guarded(key, fn, *args, **kwargs)
+
+
+def submit(name, source, fn, *args, **kwargs):
+    """
+    작업 하나를 백그라운드에서 시작하는 함수
+    :param name: str, 작업 이름 (오류 메시지용)
+    :param source: str, 데이터 소스 이름 (TIMEOUTS의 키)
+    :param fn: callable 또는 str, 실행할 함수 (또는 'module:function' 형태의 이름)
+    :return: Job, 실행 중인 작업 (회로가 열려 있으면 요청하지 않고 CircuitOpenError로 끝난 작업)
+    """
+    key = _job_key(source, fn, args, kwargs)
+    breaker = get_breaker(source)
+    if not breaker.allow():
+        future = Future()
+        future.set_exception(CircuitOpenError(
+            f"{source} 요청이 계속 실패해서 잠시 멈췄습니다 ({breaker.retry_in():.0f}초 후 다시 시도)"))
+        return Job(name, source, future, key=key)
+    if profiling.ENABLED:
+        timings = []
+        return Job(name, source, _executor.submit(_traced, timings, name, key, fn, *args, **kwargs), timings, key)
+    return Job(name, source, _executor.submit(_guarded, key, fn, *args, **kwargs), key=key)
+
+
+def start(jobs):
+    """
+    서로 독립적인 I/O 작업들을 한꺼번에 시작하는 함수
+    :param jobs: dict, 작업 이름 -> (소스 이름, 함수, 인자...) 튜플
+    :return: dict, 작업 이름 -> Job
+    """
+    return {name: submit(name, source, fn, *args) for name, (source, fn, *args) in jobs.items()}
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+# 한 번에 비교할 분석 기간(주)
+WINDOWS = [1, 2, 4, 8, 13, 26, 52]
+
+INDEX_PRECISION = 2
+
+# 일봉 하나가 덮는 구간 - 거래일이 끝나기 전 마지막 환율 시세를 그날의 환율로 사용
+SESSION_LENGTH = pd.Timedelta(days=1)
+# 이보다 오래된 환율 시세는 짝짓지 않음 (환율 데이터가 비어 있는 구간)
+MAX_QUOTE_AGE = pd.Timedelta(days=3)
+
+
+def _suffix_stats(series):
+    """
+    시계열 끝에서부터 k개 값의 평균과 중앙값을 모든 k에 대해 한 번에 계산하는 함수
+    :param series: Series, 시간순으로 정렬된 값
+    :return: tuple, (평균 배열, 중앙값 배열) - 배열의 [k-1] 위치가 마지막 k개 값의 통계
+    """
+    reversed_values = series.to_numpy(dtype='float64')[::-1]
+    means = np.cumsum(reversed_values) / np.arange(1, len(reversed_values) + 1)
+    medians = pd.Series(reversed_values).expanding().median().to_numpy()
+    return means, medians
+
+
+def _pick(stats, counts):
+    # counts개 값에 해당하는 통계를 고르고, 값이 없는 기간은 NaN으로 채움
+    counts = np.asarray(counts)
+    picked = np.full(len(counts), np.nan)
+    valid = counts > 0
+    picked[valid] = stats[counts[valid] - 1]
+    return picked
+
+
+def _counts_since(series, cutoffs):
+    # 각 기간 시작 시각 이후의 값 개수
+    return len(series) - np.searchsorted(series.index.to_numpy(), cutoffs, side='left')
+
+
+def derive(today_index, today_quote, index_median, quote_median, index_mean, quote_mean, ratio_mean, invert=False, precision=2):
+    """
+    기간 통계값(반올림 전)으로부터 적정환율과 네 가지 조건을 계산하는 함수
+    스칼라와 배열을 모두 받으므로 기간 비교(sweep)와 과거 재현(backtest)에서 함께 사용함
+    :param today_index: float 또는 array, 현재 기준 지수
+    :param today_quote: float 또는 array, 현재 환율 시세 (역수 변환 전)
+    :param index_median: float 또는 array, 기간 내 지수 중앙값
+    :param quote_median: float 또는 array, 기간 내 환율 시세 중앙값
+    :param index_mean: float 또는 array, 기간 내 지수 평균
+    :param quote_mean: float 또는 array, 기간 내 환율 시세 평균
+    :param ratio_mean: float 또는 array, 기간 내 거래일 단위 갭 비율 평균
+    :param invert: bool, 환율 시세의 역수를 원화 환율로 쓰는지 여부
+    :param precision: int, 환율 소수점 자리수
+    :return: dict, 지표/조건 이름 -> 값
+    """
+    def to_fx(quote):
+        # 엔화처럼 역수로 표시하는 통화는 반올림한 값의 역수를 다시 반올림함 (기존 계산 방식 유지)
+        return np.round(1 / quote, precision) if invert else quote
+
+    today_index = np.round(today_index, INDEX_PRECISION)
+    today_fx = to_fx(np.round(today_quote, precision))
+    index_median = np.round(index_median, INDEX_PRECISION)
+    fx_median = to_fx(np.round(quote_median, precision))
+    avg_index = np.round(index_mean, INDEX_PRECISION)
+    avg_quote = np.round(quote_mean, precision)
+    avg_gap_ratio = np.round(ratio_mean * 100, INDEX_PRECISION)
+    estimate = np.round((today_index / avg_gap_ratio) * 100, precision)
+    gap_ratio_new = np.round((today_index / fx_median) * 100, INDEX_PRECISION)
+
+    values = {
+        'today_index': today_index,
+        'today_fx': today_fx,
+        'index_median': index_median,
+        'fx_median': fx_median,
+        'index_gap_ratio': np.round((today_index / index_median) * 100, INDEX_PRECISION),
+        'avg_gap_ratio': avg_gap_ratio,
+        'avg_index': avg_index,
+        'avg_quote': avg_quote,
+        'avg_fx': to_fx(avg_quote),
+        'estimate': estimate,
+        'index_gap_percentage': np.round(((today_index - index_median) / index_median) * 100, 1),
+        'gap_ratio_new': gap_ratio_new,
+        # 조건 1은 같은 단위(원화 환율)의 평균과 비교함 - 역수로 표시하는 통화는 역수를 취한 평균(avg_fx)
+        'condition1': today_fx < to_fx(avg_quote),
+        'condition2': today_index < avg_index,
+        'condition3': gap_ratio_new > avg_gap_ratio,
+        'condition4': today_fx < estimate,
+    }
+    values['suitable_conditions'] = (
+        np.asarray(values['condition1'], dtype=int) + np.asarray(values['condition2'], dtype=int)
+        + np.asarray(values['condition3'], dtype=int) + np.asarray(values['condition4'], dtype=int))
+    return values
+
+
+def _build(index_close, quote_close, index_counts, quote_counts, ratio_counts, ratio, invert, precision):
+    """
+    기간별 값 개수를 받아 모든 기간의 지표를 배열 연산으로 계산하는 함수
+    (갭 비율 ratio는 align으로 거래일 단위로 맞춘 값)
+    """
+    index_means, index_medians = _suffix_stats(index_close)
+    quote_means, quote_medians = _suffix_stats(quote_close)
+    ratio_means, _ = _suffix_stats(ratio)
+
+    values = derive(
+        float(index_close.iloc[-1]), float(quote_close.iloc[-1]),
+        _pick(index_medians, index_counts), _pick(quote_medians, quote_counts),
+        _pick(index_means, index_counts), _pick(quote_means, quote_counts),
+        _pick(ratio_means, ratio_counts), invert, precision)
+    frame = pd.DataFrame(values, index=range(len(index_counts)))
+    previous_quote = quote_close.iloc[-2]
+    frame.insert(2, 'previous_fx', np.round(1 / previous_quote, precision) if invert else np.round(previous_quote, precision))
+    return frame
+
+
+def align(index_close, quote_close, invert=False):
+    """
+    일봉 지수와 시간봉 환율을 지수의 거래일 단위로 맞춰 하나의 프레임으로 만드는 함수
+    각 거래일에는 그날이 끝나기 전 마지막 환율 시세를 짝지음 (as-of 조인)
+    :param index_close: Series, 기준 지수 일봉 종가 (UTC 인덱스)
+    :param quote_close: Series, 환율 시간봉 종가 (UTC 인덱스)
+    :param invert: bool, 환율 시세의 역수를 원화 환율로 쓰는지 여부
+    :return: DataFrame, 거래일 인덱스와 index_close, quote_close, fx, gap_ratio 컬럼
+    """
+    index_close = index_close.dropna().sort_index()
+    quote_close = quote_close.dropna().sort_index()
+    sessions = index_close.index.as_unit('ns')
+    left = pd.DataFrame({'session_end': sessions + SESSION_LENGTH, 'index_close': index_close.to_numpy()})
+    right = pd.DataFrame({'quote_time': quote_close.index.as_unit('ns'), 'quote_close': quote_close.to_numpy()})
+    aligned = pd.merge_asof(
+        left, right, left_on='session_end', right_on='quote_time',
+        direction='backward', allow_exact_matches=False, tolerance=MAX_QUOTE_AGE)
+    aligned.index = sessions
+    aligned['fx'] = 1 / aligned['quote_close'] if invert else aligned['quote_close']
+    aligned['gap_ratio'] = aligned['index_close'] / aligned['fx']
+    return aligned[['index_close', 'quote_close', 'fx', 'gap_ratio']].dropna()
+
+
+def sweep(index_close, quote_close, windows=WINDOWS, invert=False, precision=2, now=None, aligned=None):
+    """
+    여러 분석 기간의 적정환율, 갭 비율, 네 가지 조건을 한 번에 계산하는 함수
+    각 시계열을 한 번씩만 훑어 모든 기간의 평균/중앙값을 구함
+    :param index_close: Series, 기준 지수 종가 (UTC 인덱스, 가장 긴 기간 이상의 데이터)
+    :param quote_close: Series, 환율 종가 (UTC 인덱스)
+    :param windows: list, 분석 기간(주) 목록
+    :param invert: bool, 환율 시세의 역수를 원화 환율로 쓰는지 여부 (KRWJPY=X -> JPY/KRW)
+    :param precision: int, 환율 소수점 자리수
+    :param now: Timestamp, 기간의 기준 시각 (기본값: 현재 시각)
+    :param aligned: DataFrame, 이미 계산한 align 결과 (없으면 새로 계산)
+    :return: DataFrame, 분석 기간(주)을 인덱스로 하는 지표와 조건 표
+    """
+    now = now or pd.Timestamp.now(tz='UTC')
+    cutoffs = np.array([(now - pd.Timedelta(weeks=w)).tz_convert(None).to_datetime64() for w in windows])
+    index_close = index_close.dropna()
+    quote_close = quote_close.dropna()
+    if aligned is None:
+        aligned = align(index_close, quote_close, invert)
+    ratio = aligned['gap_ratio'].dropna()
+    frame = _build(
+        index_close, quote_close,
+        _counts_since(index_close.tz_convert(None), cutoffs),
+        _counts_since(quote_close.tz_convert(None), cutoffs),
+        _counts_since(ratio.tz_convert(None), cutoffs),
+        ratio, invert, precision)
+    frame.index = pd.Index(windows, name='weeks')
+    return frame
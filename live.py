@@ -0,0 +1,152 @@
+"""
+실시간 모드: 프로세스마다 하나의 생산자 스레드가 최신 시세를 받아 지표를 갱신하고,
+모든 화면 세션은 생산자가 만들어 둔 최신 상태를 읽기만 한다 (세션 수와 상관없이 다운로드는 한 번)
+"""
+import logging
+import os
+import threading
+from collections import deque, namedtuple
+
+import pandas as pd
+
+import market_data
+import pairs
+from streaming import StreamingIndicators
+
+logger = logging.getLogger('live')
+
+# 최신 시세를 받는 주기(초)
+LIVE_INTERVAL = int(os.environ.get('LIVE_INTERVAL', 60))
+
+# 차트에 남겨둘 최근 갱신 수 (1분 주기 기준 하루)
+MAX_POINTS = 24 * 60
+
+# 통화쌍 하나의 실시간 상태
+# values: 지표 (pairs.evaluate와 같은 키), previous_fx: 직전 갱신의 현재 환율, ts: 마지막 시세 시각,
+# points: 갱신 시각별 today_fx / estimate 표, version: 갱신 번호
+LiveState = namedtuple('LiveState', ['values', 'previous_fx', 'ts', 'points', 'version'])
+
+
+class LiveFeed:
+    """
+    등록된 통화쌍의 최신 시세를 주기적으로 받아 지표를 갱신하는 생산자
+    """
+
+    def __init__(self, interval=LIVE_INTERVAL, downloader=None):
+        """
+        :param interval: float, 시세를 받는 주기(초)
+        :param downloader: callable, 시세 다운로드 함수 (기본값: yfinance)
+        """
+        self.interval = interval
+        self.downloader = downloader
+        self.error = None  # 마지막 갱신에서 발생한 오류 (화면 표시용)
+        self._names = set()
+        self._states = {}
+        self._streams = {}  # 통화쌍 이름 -> StreamingIndicators (새 봉과 시세만 반영)
+        self._points = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def watch(self, name):
+        """
+        통화쌍을 갱신 대상에 추가하고 생산자 스레드가 없으면 시작하는 함수
+        :param name: str, 통화쌍 이름 (pairs.PAIRS의 키)
+        """
+        with self._lock:
+            if name not in self._names:
+                self._names.add(name)
+                self._wakeup.set()  # 새 통화쌍은 다음 주기를 기다리지 않고 바로 갱신
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='live-feed', daemon=True)
+                self._thread.start()
+
+    def snapshot(self, name):
+        """
+        통화쌍의 최신 상태를 반환하는 함수 (세션에서 호출, 계산 없이 읽기만 함)
+        :return: LiveState 또는 None, 아직 갱신 전이면 None
+        """
+        with self._lock:
+            return self._states.get(name)
+
+    def _run(self):
+        while True:
+            try:
+                self.tick()
+                self.error = None
+            except Exception as e:
+                self.error = e
+                logger.exception("실시간 시세를 갱신하는 도중 오류가 발생했습니다")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def tick(self):
+        """
+        등록된 모든 통화쌍의 최신 시세를 한 번에 받아 지표를 갱신하는 함수
+        기간 데이터는 market_data 캐시를 거치므로 봉이 바뀔 때만 새로 받고, 매 주기에는 1분봉 시세만 받음
+        지표는 통화쌍별 스트리밍 객체에 새 봉과 시세만 넣어 갱신함 (기간 전체를 다시 계산하지 않음)
+        """
+        with self._lock:
+            specs = [pairs.PAIRS[name] for name in sorted(self._names)]
+        if not specs:
+            return
+        index_closes, fx_closes = pairs.load(specs, max(spec.weeks for spec in specs))
+        ticks = market_data.fetch_last_prices([spec.fx_ticker for spec in specs], self.downloader)
+
+        errors = []
+        for spec in specs:
+            try:
+                stream = self._streams.get(spec.name)
+                if stream is None:
+                    stream = StreamingIndicators.from_history(
+                        index_closes[spec.index_ticker], fx_closes[spec.fx_ticker], spec.weeks, spec.invert, spec.precision)
+                    self._streams[spec.name] = stream
+                else:
+                    stream.update(index_closes[spec.index_ticker], fx_closes[spec.fx_ticker])
+                ts = stream.quote.last()[0]
+                if spec.fx_ticker in ticks:
+                    ts, price = ticks[spec.fx_ticker]
+                    if ts.floor('h') >= stream.quote.last()[0]:
+                        stream.add_quote(ts.floor('h'), price)  # 진행 중인 시간봉의 종가를 최신 시세로 갱신
+                self._publish(spec.name, stream.values(), ts)
+            except Exception as e:
+                errors.append(f"{spec.name}: {e}")  # 한 통화쌍이 실패해도 나머지는 계속 갱신
+        if errors:
+            raise ValueError(", ".join(errors))
+
+    def _publish(self, name, values, ts):
+        # 차트용 표는 생산자가 한 번만 만들고, 세션은 같은 객체를 읽기만 함
+        with self._lock:
+            previous = self._states.get(name)
+            changed = previous is None or previous.ts != ts or previous.values['today_fx'] != values['today_fx']
+            if previous is None:
+                previous_fx = values['previous_fx']  # 첫 갱신은 직전 시간봉과 비교
+            elif changed:
+                previous_fx = previous.values['today_fx']
+            else:
+                previous_fx = previous.previous_fx  # 시세가 그대로면 직전 변화를 유지
+            points = self._points.setdefault(name, deque(maxlen=MAX_POINTS))
+            if changed:
+                points.append((ts, values['today_fx'], values['estimate']))
+            self._version += 1
+            self._states[name] = LiveState(
+                values, previous_fx, ts,
+                pd.DataFrame(list(points), columns=['ts', 'today_fx', 'estimate']).set_index('ts'),
+                self._version)
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_feed():
+    """
+    프로세스 전역 실시간 생산자를 반환하는 함수
+    :return: LiveFeed, 실시간 생산자
+    """
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = LiveFeed()
+    return _feed
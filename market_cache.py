@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Call:
+    """
+    진행 중인 로딩 한 건을 나타내는 객체 (같은 키의 동시 요청이 결과를 공유함)
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    프로세스 전역에서 공유하는 TTL + LRU 캐시
+    같은 키에 대한 동시 요청은 로딩을 한 번만 수행하고 결과를 나눠 가진다 (single-flight)
+    """
+
+    def __init__(self, maxsize=64):
+        """
+        :param maxsize: int, 보관할 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (만료 시각, 값)
+        self._inflight = {}  # key -> _Call
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader, ttl, cacheable=None):
+        """
+        캐시에 유효한 값이 있으면 반환하고, 없으면 loader를 호출해 채운 뒤 반환하는 함수
+        :param key: hashable, 캐시 키
+        :param loader: callable, 인자 없이 호출되어 값을 반환하는 함수
+        :param ttl: float, 값의 유효 시간(초)
+        :param cacheable: callable, 값을 받아 캐시할지 여부를 반환하는 함수 (None이면 항상 캐시, 캐시하지 않아도 기다리던 요청에는 전달함)
+        :return: object, 캐시된 값
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                return entry[1]
+            call = self._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._inflight[key] = call
+
+        # 이미 다른 요청이 로딩 중이면 그 결과를 기다림
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = loader()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if call.error is None and (cacheable is None or cacheable(call.value)):
+                    self._data[key] = (time.monotonic() + ttl, call.value)
+                    self._data.move_to_end(key)
+                    while len(self._data) > self.maxsize:
+                        self._data.popitem(last=False)
+            call.done.set()
+        return call.value
+
+    def invalidate(self, key):
+        """
+        특정 키의 캐시 값을 제거하는 함수
+        :param key: hashable, 캐시 키
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        캐시 전체를 비우는 함수
+        """
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,118 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+import profiling
+import sources
+from bar_store import BarStore, normalize_frame, select_ticker
+from market_cache import TTLCache
+
+# 봉 간격별 캐시 유효 시간(초) - 봉이 갱신되는 주기에 맞춤
+TTL_BY_INTERVAL = {
+    '1h': 5 * 60,
+    '1d': 30 * 60,
+}
+DEFAULT_TTL = 5 * 60
+
+# 모든 세션(스레드)이 함께 사용하는 프로세스 전역 캐시
+_cache = TTLCache(maxsize=32)
+
+# 봉 데이터를 누적 저장하는 로컬 파일 (처음 사용할 때 생성)
+BAR_STORE_PATH = os.environ.get('BAR_STORE_PATH', 'bars.sqlite3')
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    프로세스 전역 봉 저장소를 반환하는 함수
+    :return: BarStore, 봉 저장소
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BarStore(BAR_STORE_PATH)
+    return _store
+
+
+def _yf_download(ticker, start, end, interval):
+    # DATA_SOURCE에 따라 실제 다운로드 / 녹화 / 재생 (sources.py)
+    return sources.yahoo_download(ticker, start, end, interval)
+
+
+def fetch_history(ticker, period_weeks, interval='1d', downloader=None, cache=None, store=None):
+    """
+    지정된 기간의 시세 데이터를 캐시와 로컬 봉 저장소를 거쳐 가져오는 함수
+    저장소에 없는 최근 봉만 새로 다운로드함
+    :param ticker: str, 야후파이낸스 티커
+    :param period_weeks: int, 데이터를 가져올 기간(주)
+    :param interval: str, 봉 간격 ('1d', '1h' 등)
+    :param downloader: callable, (ticker, start, end, interval)을 받아 데이터프레임을 반환하는 함수 (기본값: yfinance)
+    :param cache: TTLCache, 사용할 캐시 (기본값: 프로세스 전역 캐시)
+    :param store: BarStore, 사용할 봉 저장소 (기본값: BAR_STORE_PATH의 저장소)
+    :return: DataFrame, UTC 인덱스를 가진 시세 데이터 (캐시 원본의 복사본)
+    """
+    downloader = downloader or _yf_download
+    cache = cache or _cache
+    ttl = TTL_BY_INTERVAL.get(interval, DEFAULT_TTL)
+
+    def load():
+        with profiling.stage(f'market_data.refresh {interval}'):
+            data = (store or get_store()).refresh(ticker, interval, period_weeks, downloader)
+        if data.empty:
+            raise ValueError(f"{ticker} 데이터가 비어 있습니다")  # 빈 결과는 캐시하지 않음
+        return data
+
+    data = cache.get_or_load((ticker, interval, period_weeks), load, ttl)
+    return data.copy()  # 호출한 쪽에서 수정해도 캐시 원본은 유지
+
+
+def fetch_closes(tickers, period_weeks, interval='1d', downloader=None, cache=None, store=None):
+    """
+    여러 티커의 종가를 한 번의 묶음 다운로드로 가져오는 함수
+    :param tickers: list, 야후파이낸스 티커 목록
+    :param period_weeks: int, 데이터를 가져올 기간(주)
+    :param interval: str, 봉 간격 ('1d', '1h' 등)
+    :param downloader: callable, (티커 목록, start, end, interval)을 받아 데이터프레임을 반환하는 함수 (기본값: yfinance)
+    :param cache: TTLCache, 사용할 캐시 (기본값: 프로세스 전역 캐시)
+    :param store: BarStore, 사용할 봉 저장소 (기본값: BAR_STORE_PATH의 저장소)
+    :return: DataFrame, 티커별 종가를 컬럼으로 하는 표 (UTC 인덱스, 거래 시간이 다른 티커는 NaN)
+    """
+    tickers = tuple(sorted(set(tickers)))
+    downloader = downloader or _yf_download
+    cache = cache or _cache
+    ttl = TTL_BY_INTERVAL.get(interval, DEFAULT_TTL)
+
+    def load():
+        with profiling.stage(f'market_data.refresh {interval}'):
+            frames = (store or get_store()).refresh_many(tickers, interval, period_weeks, downloader)
+        closes = pd.DataFrame({ticker: frame['Close'] for ticker, frame in frames.items()})
+        if closes.empty:
+            raise ValueError(f"{', '.join(tickers)} 데이터가 비어 있습니다")
+        return closes
+
+    closes = cache.get_or_load((tickers, interval, period_weeks), load, ttl)
+    return closes.copy()
+
+
+def fetch_last_prices(tickers, downloader=None):
+    """
+    여러 티커의 가장 최근 시세를 1분봉 한 번의 묶음 다운로드로 가져오는 함수 (실시간 모드용, 캐시/저장소를 거치지 않음)
+    :param tickers: list, 야후파이낸스 티커 목록
+    :param downloader: callable, (티커 목록, start, end, interval)을 받아 데이터프레임을 반환하는 함수 (기본값: yfinance)
+    :return: dict, 티커 -> (마지막 봉 시각(UTC), 종가) - 시세가 없는 티커는 빠짐
+    """
+    downloader = downloader or _yf_download
+    now = datetime.now(timezone.utc)
+    data = downloader(list(tickers), now - timedelta(days=1), now, '1m')
+    prices = {}
+    for ticker in tickers:
+        part = select_ticker(data, ticker)
+        if part is None or part.empty:
+            continue
+        close = normalize_frame(part)['Close']
+        if len(close):
+            prices[ticker] = (close.index[-1], float(close.iloc[-1]))
+    return prices
@@ -0,0 +1,267 @@
+import os
+import time
+
+import streamlit as st
+
+# pairs / estimate_store는 pandas를 불러오므로 함수 안에서 불러옴 (화면 틀을 먼저 그리도록 함)
+
+# 실시간 모드에서 화면이 생산자의 최신 상태를 다시 읽는 주기(초) - 읽기만 하므로 짧게 둠
+LIVE_REFRESH = float(os.environ.get('LIVE_REFRESH', 5))
+
+# 기간별 비교 표에 보여줄 지표 -> 표시 이름
+SWEEP_COLUMNS = {
+    'today_fx': '현재환율',
+    'estimate': '적정환율',
+    'avg_gap_ratio': '평균갭비율',
+    'suitable_conditions': '충족조건수',
+}
+
+
+def show_staleness(job):
+    """
+    작업이 실패하거나 늦어서 이전에 받아 둔 결과를 대신 보여주는 경우 언제 받은 값인지 표시하는 함수
+    :param job: fetcher.Job, 결과를 받은 작업
+    """
+    if job.stale_since is None:
+        return
+    minutes = int((time.time() - job.stale_since) // 60)
+    st.caption(f"⏳ {minutes}분 전에 받은 {job.source} 데이터를 표시합니다 ({job.stale_reason})")
+
+
+def wait_results(job):
+    """
+    통화쌍 계산 작업 결과를 기다리고, 실패하면 오류를 표시한 뒤 빈 결과를 반환하는 함수
+    :param job: fetcher.Job, pairs.evaluate 작업 (수집기 기록만 쓰느라 작업을 시작하지 않았으면 None)
+    :return: dict, 통화쌍 이름 -> PairResult 또는 예외 객체
+    """
+    if job is None:
+        return {}
+    try:
+        with st.spinner("시세 데이터를 불러오는 중입니다..."):
+            results = job.result()
+    except Exception as e:
+        st.error(f"시세 데이터를 다운로드하는 도중 오류가 발생했습니다: {e}")
+        return {}
+    show_staleness(job)
+    return results
+
+
+def wait_frames(job, names):
+    """
+    스프레드시트 작업 결과를 기다리고, 실패하면 오류를 표시한 뒤 빈 데이터프레임을 반환하는 함수
+    :param job: fetcher.Job, 스프레드시트 읽기 작업
+    :param names: list, 읽으려던 데이터 이름 목록
+    :return: dict, 데이터 이름 -> DataFrame
+    """
+    try:
+        frames = job.result()
+    except Exception as e:
+        st.error(f"스프레드시트 데이터를 가져오는 도중 오류가 발생했습니다: {e}")
+        import sheets
+        return sheets.empty_frames(names)
+    show_staleness(job)
+    return frames
+
+
+def wait_snapshots(job):
+    """
+    수집기(collector.py) 기록을 읽는 작업 결과를 기다리는 함수 (읽지 못하면 빈 결과를 반환해서 직접 계산하도록 함)
+    :param job: fetcher.Job, estimate_store.load_snapshots 작업
+    :return: dict, 통화쌍 이름 -> estimate_store.Snapshot
+    """
+    try:
+        return job.result()
+    except Exception:
+        return {}
+
+
+def pairs_to_compute(names, snapshots):
+    """
+    수집기 기록이 충분히 최근이 아니어서 화면에서 직접 다운로드 / 계산해야 하는 통화쌍 목록을 반환하는 함수
+    :param names: list, 통화쌍 이름 목록
+    :param snapshots: dict, wait_snapshots 결과
+    :return: list, 직접 계산할 통화쌍 이름 목록
+    """
+    return [name for name in names if name not in snapshots or time.time() >= snapshots[name].fresh_until]
+
+
+def latest_rows(frame, count, date_format=None):
+    """
+    시간순 추세 데이터에서 최근 count개 행만 최신순으로 꺼내는 함수
+    날짜는 이때 꺼낸 행만 문자열로 바꿈 (전체 데이터는 datetime64 그대로 둠)
+    :param frame: DataFrame, sheets.parse 결과
+    :param count: int, 행 수
+    :param date_format: str, 현재날짜 컬럼의 표시 형식 (None이면 바꾸지 않음)
+    :return: DataFrame, 최신순으로 정렬된 행
+    """
+    rows = frame.tail(count).iloc[::-1].reset_index(drop=True)
+    if date_format is not None and '현재날짜' in rows:
+        rows['현재날짜'] = rows['현재날짜'].dt.strftime(date_format)
+    return rows
+
+
+def show_trend_chart(frame, columns, key, date_format=None):
+    """
+    추세 산포도 차트를 그리는 함수
+    점이 charts.CHART_POINTS개보다 많으면 모양을 유지하며 줄여서 보내고, 구간 슬라이더로 고른 구간만 다시 줄여서
+    (구간이 충분히 좁으면 원래 해상도로) 그림
+    :param frame: DataFrame, 시간순 추세 데이터 (현재날짜 컬럼이 있으면 x축으로 사용)
+    :param columns: list, 그릴 컬럼 목록
+    :param key: str, 구간 슬라이더의 위젯 키
+    :param date_format: str, 점을 줄이지 않을 때의 x축 날짜 표시 형식 (None이면 날짜를 그대로 사용)
+    """
+    import charts
+
+    x_column = '현재날짜' if '현재날짜' in frame else None
+    window = None
+    if len(frame) > charts.CHART_POINTS:
+        if x_column:
+            first, last = frame[x_column].min().to_pydatetime(), frame[x_column].max().to_pydatetime()
+        else:
+            first, last = 0, len(frame) - 1
+        window = st.slider("차트 구간", min_value=first, max_value=last, value=(first, last), key=key)
+        if window == (first, last):
+            window = None
+
+    data = charts.prepare(frame, columns, x_column, window)
+    if date_format is not None and x_column and len(frame) <= charts.CHART_POINTS:
+        data.index = data.index.strftime(date_format)  # 기간이 길면 날짜 축 그대로 그림 (같은 표시 문자열이 겹치지 않도록)
+    if len(data) < len(frame) and window is None:
+        st.caption(f"{len(frame)}개 중 {len(data)}개 점을 표시합니다 (구간을 좁히면 자세히 볼 수 있음)")
+    st.scatter_chart(data)
+
+
+def show_usd_trend(frames):
+    """
+    원달러 24시간 추세 차트와 최근 기록 표를 그리는 함수 (yen.py의 달러 탭과 dollar.py가 함께 사용)
+    :param frames: dict, wait_frames 결과 (usd_trend, usd_history 포함)
+    """
+    st.write('24시간추세')
+    show_trend_chart(frames['usd_trend'].tail(24), ['적정원달러환율', '현재원달러환율'], 'usd_chart')
+    st.table(latest_rows(frames['usd_history'], 24, '%Y-%m-%d %H:%M:%S'))
+
+
+def condition_labels(spec):
+    return [
+        f'조건1 (현재 {spec.fx_label} 환율 < {spec.weeks}주 평균 환율)',
+        f'조건2 (현재 {spec.index_label} < {spec.weeks}주 평균 {spec.index_label})',
+        f'조건3 (현재 {spec.gap_label} > {spec.weeks}주 평균 {spec.gap_label})',
+        f'조건4 (현재 {spec.fx_label} 환율 < 적정 {spec.fx_label} 환율)',
+    ]
+
+
+def show_exchange_rate(spec, values, last_tick=None):
+    """
+    현재 환율과 적정환율 비교, 네 가지 조건을 표시하는 함수
+    :param spec: PairSpec, 통화쌍 설정
+    :param values: dict, 계산된 지표들을 포함하는 딕셔너리
+    :param last_tick: float, 실시간 모드의 직전 시세 (주면 직전 시세 대비 변화량을 표시)
+    """
+    import pairs
+
+    conditions = pairs.check_conditions(values)
+
+    today_fx = values['today_fx']
+    estimate = values['estimate']
+    is_fair_value = today_fx < estimate
+
+    emoji = "☀️" if is_fair_value else "🌧️"
+    status_text = "적정환율" if is_fair_value else "과대평가"
+
+    if last_tick is not None:
+        delta = round(today_fx - last_tick, spec.precision)
+        label = f"야후파이낸스 실시간 (직전 시세: {last_tick}원 현재: {today_fx} 원)"
+    elif spec.delta_base == 'previous':
+        previous_fx = values['previous_fx']
+        delta = round(today_fx - previous_fx, spec.precision)
+        label = f"야후파이낸스기준 (전일종가: {previous_fx}원 현재: {today_fx} 원)"
+    else:
+        delta = round(today_fx - estimate, spec.precision)
+        label = f"야후파이낸스기준 현재: {today_fx} 원"
+
+    st.metric(label=label, value=f"{emoji}", delta=f"{delta} 원")
+    st.write(f"현재 {spec.fx_label} 환율은 {estimate} 원의 적정환율과 비교하여 {status_text}되어 있습니다.")
+
+    # 조건 표시
+    for label, condition in zip(condition_labels(spec), conditions):
+        condition_status = "✅" if condition else "❌"
+        st.write(f"{label}: {condition_status}")
+
+
+@st.fragment(run_every=LIVE_REFRESH)
+def show_live(name):
+    """
+    실시간 생산자(live.py)가 갱신한 최신 지표와 추이 차트를 그리는 구간
+    LIVE_REFRESH초마다 이 구간만 다시 실행되며, 다운로드나 계산 없이 공유 상태를 읽기만 함
+    :param name: str, 통화쌍 이름 (pairs.PAIRS의 키)
+    """
+    import live
+    import pairs
+
+    feed = live.get_feed()
+    feed.watch(name)
+    state = feed.snapshot(name)
+    if feed.error is not None:
+        st.warning(f"실시간 시세를 갱신하지 못했습니다: {feed.error}")
+    if state is None:
+        st.info("실시간 시세를 기다리는 중입니다...")
+        return
+
+    show_exchange_rate(pairs.PAIRS[name], state.values, last_tick=state.previous_fx)
+    st.caption(f"마지막 시세: {state.ts.tz_convert('Asia/Seoul'):%Y-%m-%d %H:%M} (갱신 주기 {live.LIVE_INTERVAL}초)")
+    st.line_chart(state.points.rename(columns={'today_fx': '현재환율', 'estimate': '적정환율'}))
+
+
+def show_pair(name, results, live_mode=False, snapshots=None):
+    """
+    통화쌍 하나의 적정환율 화면(현재 지표 + 기간별 비교)을 구성하는 함수
+    :param name: str, 통화쌍 이름 (pairs.PAIRS의 키)
+    :param results: dict, pairs.evaluate 결과
+    :param live_mode: bool, 현재 지표를 실시간 생산자의 최신 상태로 표시할지 여부
+    :param snapshots: dict, wait_snapshots 결과 (수집기 기록)
+    """
+    import pairs
+
+    spec = pairs.PAIRS[name]
+    result = results.get(name)
+    if isinstance(result, Exception):
+        st.error(f"{spec.fx_label} 데이터를 다운로드하는 도중 오류가 발생했습니다: {result}")
+        result = None
+
+    # 수집기 기록과 직접 계산한 결과 중 더 최근 봉 기준인 쪽을 현재 지표와 기간별 비교 표에 함께 사용
+    snapshot = (snapshots or {}).get(name)
+    origin = '직접 계산'
+    if snapshot is not None and (result is None or snapshot.result.ts >= result.ts):
+        result, origin = snapshot.result, '수집기 기록'
+
+    if live_mode:
+        show_live(name)
+    elif result is not None:
+        show_exchange_rate(spec, result.values)
+
+    if result is not None:
+        st.caption(f"기준 시각: {result.ts.tz_convert('Asia/Seoul'):%Y-%m-%d %H:%M} ({origin})")
+        with st.expander("기간별 적정환율 비교"):
+            st.dataframe(result.sweep[list(SWEEP_COLUMNS)].rename(columns=SWEEP_COLUMNS))
+
+
+def show_timings(jobs):
+    """
+    PROFILE_STAGES=1일 때 이번 실행의 작업별 단계 시간과 프로세스 전체의 최근 요약을 사이드바에 표시하는 함수
+    :param jobs: dict, 작업 이름 -> fetcher.Job
+    """
+    import profiling
+
+    if not profiling.ENABLED:
+        return
+    with st.sidebar.expander("단계별 실행 시간"):
+        st.dataframe([
+            {'작업': name, '단계': stage, 'ms': round(seconds * 1000, 1)}
+            for name, job in jobs.items() if job.future.done()
+            for stage, seconds in job.timings or []
+        ], hide_index=True)
+        st.caption("프로세스 전체 최근 기록 (모든 세션)")
+        st.dataframe([
+            {'단계': stage, '횟수': count, '중앙값(ms)': round(median, 1), 'p95(ms)': round(p95, 1)}
+            for stage, count, median, p95 in profiling.summary()
+        ], hide_index=True)
@@ -0,0 +1,101 @@
+from collections import namedtuple
+
+import pandas as pd
+
+import indicators
+import market_data
+import profiling
+import shared_cache
+
+# 통화쌍 설정
+# name: 통화쌍 이름, index_ticker: 기준 지수 티커, fx_ticker: 환율 티커,
+# invert: 환율 시세의 역수를 원화 환율로 쓰는지 여부, precision: 환율 소수점 자리수, weeks: 기본 분석 기간(주),
+# fx_label / index_label / gap_label: 화면 표시 이름, delta_base: 지표 변화량 기준 ('previous': 직전 봉, 'estimate': 적정환율)
+PairSpec = namedtuple('PairSpec', [
+    'name', 'index_ticker', 'fx_ticker', 'invert', 'precision', 'weeks',
+    'fx_label', 'index_label', 'gap_label', 'delta_base',
+])
+
+PAIRS = {
+    'jpy': PairSpec('jpy', '^N225', 'KRWJPY=X', True, 4, 4, 'JPY/KRW', 'Nikkei 225 지수', 'Nikkei 갭 비율', 'previous'),
+    'usd': PairSpec('usd', 'DX-Y.NYB', 'USDKRW=X', False, 2, 4, 'USD/KRW', 'USD 인덱스', 'USD 갭 비율', 'estimate'),
+    'eur': PairSpec('eur', '^STOXX50E', 'EURKRW=X', False, 2, 4, 'EUR/KRW', 'Euro Stoxx 50 지수', 'EUR 갭 비율', 'estimate'),
+    'cny': PairSpec('cny', '000001.SS', 'CNYKRW=X', False, 2, 4, 'CNY/KRW', '상해종합지수', 'CNY 갭 비율', 'estimate'),
+}
+
+# 통화쌍 하나의 계산 결과 (values: 기본 분석 기간의 지표, sweep: 기간별 지표 표, ts: 마지막 환율 봉 시각)
+PairResult = namedtuple('PairResult', ['values', 'sweep', 'ts'])
+
+# 공유 캐시(SHARED_CACHE)에 올린 계산 결과를 모든 레플리카가 재사용하는 시간(초) - 시간봉 갱신 주기와 같음
+RESULT_TTL = market_data.TTL_BY_INTERVAL['1h']
+
+
+def load(specs, weeks):
+    """
+    모든 통화쌍의 기준 지수(일봉)와 환율(시간봉)을 봉 간격별로 한 번씩 묶어서 다운로드하는 함수
+    :param specs: list, PairSpec 목록
+    :param weeks: int, 다운로드할 기간(주)
+    :return: tuple, (지수 종가 표, 환율 종가 표) - 티커별 컬럼
+    """
+    index_closes = market_data.fetch_closes([spec.index_ticker for spec in specs], weeks)
+    fx_closes = market_data.fetch_closes([spec.fx_ticker for spec in specs], weeks, '1h')
+    return index_closes, fx_closes
+
+
+def align_all(specs, index_closes, fx_closes):
+    """
+    모든 통화쌍을 거래일 단위로 맞춘 결과를 하나의 프레임으로 만드는 함수
+    :return: DataFrame, (통화쌍 이름, 필드) 2단 컬럼을 가진 정렬 결과
+    """
+    return pd.concat({
+        spec.name: indicators.align(index_closes[spec.index_ticker], fx_closes[spec.fx_ticker], spec.invert)
+        for spec in specs
+        if spec.index_ticker in index_closes and spec.fx_ticker in fx_closes
+    }, axis=1)
+
+
+def evaluate(specs, windows=indicators.WINDOWS):
+    """
+    여러 통화쌍의 지표를 한 번의 묶음 다운로드와 하나의 정렬 프레임으로 계산하는 함수
+    :param specs: list, PairSpec 또는 통화쌍 이름(PAIRS의 키) 목록
+    :param windows: list, 기간별 비교에 사용할 분석 기간(주) 목록
+    :return: dict, 통화쌍 이름 -> PairResult (데이터가 없는 통화쌍은 예외 객체)
+    """
+    specs = [PAIRS[spec] if isinstance(spec, str) else spec for spec in specs]
+    # 여러 레플리카가 떠 있으면 갱신 주기마다 한 프로세스만 다운로드 / 계산함 (실패가 섞인 결과는 공유하지 않음)
+    return shared_cache.cached(
+        ('pairs.evaluate', tuple(specs), tuple(windows)), lambda: _evaluate(specs, windows), RESULT_TTL,
+        lambda results: not any(isinstance(result, Exception) for result in results.values()))
+
+
+def _evaluate(specs, windows):
+    weeks = max(list(windows) + [spec.weeks for spec in specs])
+    with profiling.stage('pairs.load'):
+        index_closes, fx_closes = load(specs, weeks)
+    with profiling.stage('pairs.align'):
+        aligned = align_all(specs, index_closes, fx_closes)
+
+    results = {}
+    for spec in specs:
+        try:
+            if spec.name not in aligned.columns.get_level_values(0):
+                raise ValueError(f"{spec.index_ticker} / {spec.fx_ticker} 데이터가 비어 있습니다")
+            pair_windows = sorted(set(windows) | {spec.weeks})
+            with profiling.stage('pairs.sweep'):
+                table = indicators.sweep(
+                    index_closes[spec.index_ticker], fx_closes[spec.fx_ticker], pair_windows,
+                    spec.invert, spec.precision, aligned=aligned[spec.name].dropna())
+            ts = fx_closes[spec.fx_ticker].last_valid_index()
+            results[spec.name] = PairResult(table.loc[spec.weeks].to_dict(), table.loc[list(windows)], ts)
+        except Exception as e:
+            results[spec.name] = e
+    return results
+
+
+def check_conditions(values):
+    """
+    투자 적합성 조건을 확인하는 함수
+    :param values: dict, 계산된 지표들을 포함하는 딕셔너리
+    :return: tuple, 각 조건의 만족 여부를 나타내는 불리언 값들의 튜플
+    """
+    return tuple(bool(values[f'condition{i}']) for i in range(1, 5))
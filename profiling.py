@@ -0,0 +1,84 @@
+"""
+단계별 실행 시간 기록 (PROFILE_STAGES=1일 때만 동작, 꺼져 있으면 아무것도 하지 않음)
+
+- stage(name): with 블록의 실행 시간을 기록
+- 작업 스레드에서 잰 시간은 fetcher가 작업(Job)별로 모아서 화면 세션에 넘겨줌
+- 프로세스 전체의 최근 기록으로 단계별 중앙값 / p95를 계산해 부하 상황의 느려짐을 확인할 수 있음
+"""
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger('profiling')
+
+ENABLED = os.environ.get('PROFILE_STAGES', '0') == '1'
+
+# 단계별로 남겨둘 최근 기록 수 (중앙값 / p95 계산용)
+MAX_SAMPLES = 500
+
+_local = threading.local()
+_samples = {}  # 단계 이름 -> 최근 실행 시간(초) deque
+_samples_lock = threading.Lock()
+
+
+def record(name, seconds):
+    """
+    단계 하나의 실행 시간을 기록하는 함수
+    :param name: str, 단계 이름
+    :param seconds: float, 실행 시간(초)
+    """
+    trace = getattr(_local, 'trace', None)
+    if trace is not None:
+        trace.append((name, seconds))
+    with _samples_lock:
+        _samples.setdefault(name, deque(maxlen=MAX_SAMPLES)).append(seconds)
+    logger.info("%s %.1fms", name, seconds * 1000)
+
+
+@contextmanager
+def stage(name):
+    """
+    with 블록의 실행 시간을 단계 이름으로 기록하는 컨텍스트 매니저
+    :param name: str, 단계 이름
+    """
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+@contextmanager
+def collect(trace):
+    """
+    현재 스레드에서 기록되는 단계 시간을 trace 목록에도 모으는 컨텍스트 매니저
+    :param trace: list, (단계 이름, 실행 시간(초))를 모을 목록
+    """
+    previous = getattr(_local, 'trace', None)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+def summary():
+    """
+    프로세스 전체의 단계별 최근 실행 시간 요약을 반환하는 함수
+    :return: list, (단계 이름, 기록 수, 중앙값 ms, p95 ms) 목록 (이름순)
+    """
+    with _samples_lock:
+        samples = {name: list(values) for name, values in _samples.items()}
+    rows = []
+    for name in sorted(samples):
+        values = samples[name]
+        p95 = statistics.quantiles(values, n=20)[-1] if len(values) > 1 else values[0]
+        rows.append((name, len(values), statistics.median(values) * 1000, p95 * 1000))
+    return rows
@@ -0,0 +1,133 @@
+import threading
+
+import profiling
+import shared_cache
+import sources
+from market_cache import TTLCache
+
+# 연결/응답 제한 시간(초) - 재시도를 포함해도 fetcher의 investing 제한 시간 안에 끝나도록 짧게 둠
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 4
+
+# 연결 실패, 5xx, 429 응답은 지수 백오프(0.3초, 0.6초)로 최대 2번 다시 시도
+# 응답 지연(read timeout)은 다시 시도해도 빨라지지 않으므로 바로 실패 처리
+RETRY = {
+    'total': 2,
+    'read': 0,
+    'backoff_factor': 0.3,
+    'status_forcelist': [429, 500, 502, 503, 504],
+    'allowed_methods': ['GET'],
+    'respect_retry_after_header': False,  # 긴 Retry-After를 기다리다 페이지가 멈추지 않도록 함
+}
+
+# 추출한 가격을 재사용하는 시간(초)
+QUOTE_TTL = 30
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0',
+    'Accept': 'text/html',
+}
+
+# 가격이 들어 있는 요소 (찾는 즉시 파싱을 멈춤)
+PRICE_ATTRIBUTE = 'data-test'
+PRICE_VALUE = 'instrument-price-last'
+
+# 예전 페이지 구조용 경로 (가격 요소를 찾지 못했을 때만 전체 문서에서 사용)
+LEGACY_XPATH = "//*[@id='__next']/div[2]/div[2]/div[2]/div[1]/div[1]/div[3]/div[1]/div[1]/div[1]//text()"
+
+# 파서에 한 번에 넣는 크기(바이트)
+CHUNK_SIZE = 16 * 1024
+
+_cache = TTLCache(maxsize=16)
+
+# URL -> (ETag, Last-Modified, 가격) - 304 응답이면 본문 없이 마지막 가격을 그대로 사용
+_validators = {}
+_validators_lock = threading.Lock()
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    모든 세션(스레드)이 함께 쓰는 keep-alive 연결 풀을 반환하는 함수 (requests는 처음 호출할 때 불러옴)
+    :return: requests.Session, 재시도 정책이 붙은 세션
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=Retry(**RETRY))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(HEADERS)
+            _session = session
+    return _session
+
+
+def extract_price(html, chunk_size=CHUNK_SIZE):
+    """
+    HTML을 조금씩 파싱하다가 가격 요소를 찾으면 바로 멈추고 가격을 반환하는 함수
+    :param html: bytes, 페이지 본문
+    :param chunk_size: int, 파서에 한 번에 넣는 크기(바이트)
+    :return: str 또는 None, 가격 문자열 (찾지 못하면 None)
+    """
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=('end',))
+    for offset in range(0, len(html), chunk_size):
+        parser.feed(html[offset:offset + chunk_size])
+        for _, element in parser.read_events():
+            if element.get(PRICE_ATTRIBUTE) == PRICE_VALUE:
+                return ''.join(element.itertext()).strip()
+
+    # 가격 요소가 없는 예전 구조의 페이지
+    root = parser.close()
+    if root is None:
+        return None
+    texts = [text.strip() for text in root.xpath(LEGACY_XPATH) if text.strip()]
+    return "\n".join(texts) or None
+
+
+def fetch_quote(url, session=None, cache=None):
+    """
+    인베스팅닷컴 페이지에서 현재 가격을 가져오는 함수
+    QUOTE_TTL 동안은 캐시된 가격을 쓰고, 그 뒤에는 ETag/Last-Modified로 변경 여부부터 확인함
+    :param url: str, 페이지 주소
+    :param session: requests.Session, 사용할 세션 (기본값: 프로세스 전역 세션)
+    :param cache: TTLCache, 사용할 캐시 (기본값: 모듈 전역 캐시)
+    :return: str, 가격 문자열
+    :raises ValueError: 페이지에서 가격을 찾지 못한 경우
+    """
+    session = session or get_session()
+    cache = cache or _cache
+
+    def load():
+        with _validators_lock:
+            etag, last_modified, price = _validators.get(url, (None, None, None))
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        with profiling.stage('quotes.request'):
+            response = sources.http_get(session, url, headers, (CONNECT_TIMEOUT, READ_TIMEOUT))
+        if response.status_code == 304 and price is not None:
+            return price
+        response.raise_for_status()  # HTTP 에러가 발생하면 예외를 일으킴
+
+        with profiling.stage('quotes.extract_price'):
+            price = extract_price(response.content)
+        if price is None:
+            raise ValueError(f"{url} 에서 가격을 찾지 못했습니다")
+        with _validators_lock:
+            _validators[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'), price)
+        return price
+
+    # 여러 레플리카가 떠 있으면 한 프로세스만 페이지를 받고 나머지는 그 가격을 씀
+    return cache.get_or_load(url, lambda: shared_cache.cached(('quotes.fetch_quote', url), load, QUOTE_TTL), QUOTE_TTL)
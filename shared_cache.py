@@ -0,0 +1,249 @@
+"""
+여러 화면 프로세스(레플리카)가 함께 쓰는 결과 캐시
+
+로드 밸런서 뒤에서 yen.py / dollar.py를 여러 개 띄우면 프로세스마다 같은 시세를 받고 같은 지표를 계산함
+이 캐시에 결과를 올려 두면 갱신 주기마다 한 프로세스만 계산하고 나머지는 그 결과(스냅샷)를 그대로 씀
+
+SHARED_CACHE 환경 변수로 저장소를 고름
+- '' (기본값): 사용하지 않음 (프로세스별 캐시만 사용)
+- 'sqlite' 또는 'sqlite:///경로': 같은 호스트의 프로세스끼리 SQLite 파일로 공유
+- 'redis://호스트:포트/DB': 여러 호스트가 Redis(또는 같은 명령을 지원하는 서버)로 공유 (redis 패키지 필요)
+
+저장소는 get / set / add / release 네 가지만 있으면 되므로 다른 구현으로 바꿀 수 있음 (SQLiteBackend가 로컬 대체 구현)
+
+갱신 방식
+- 유효한 값이 있으면 그대로 반환
+- 만료되었으면 잠금을 잡은 프로세스 하나만 다시 계산해서 올림
+- 잠금을 못 잡은 프로세스는 만료된 값이 남아 있으면 그 값을 바로 쓰고, 없으면 새 값이 올라올 때까지 기다림
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from market_cache import TTLCache
+
+SHARED_CACHE = os.environ.get('SHARED_CACHE', '')
+
+# SHARED_CACHE=sqlite일 때 쓰는 파일
+SHARED_CACHE_PATH = os.environ.get('SHARED_CACHE_PATH', 'shared_cache.sqlite3')
+
+# 갱신 잠금 유지 시간(초) - 잠금을 잡은 프로세스가 죽어도 이 시간이 지나면 다른 프로세스가 갱신함
+LOCK_TTL = 60
+
+# 이전 값이 없을 때 다른 프로세스의 갱신을 기다리는 최대 시간(초) - 넘으면 직접 계산함
+LOCK_WAIT = 20
+
+# 다른 프로세스의 갱신 결과를 확인하는 간격(초)
+POLL_INTERVAL = 0.2
+
+# 공유 저장소에서 읽은 값을 프로세스 안에서 재사용하는 시간(초) - 같은 프로세스의 세션들이 저장소를 한 번만 읽도록 함
+LOCAL_TTL = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class SQLiteBackend:
+    """
+    같은 호스트의 프로세스끼리 공유하는 SQLite 파일 저장소 (Redis의 GET / SET PX / SET NX PX와 같은 동작)
+    """
+
+    def __init__(self, path):
+        """
+        :param path: str, SQLite 파일 경로
+        """
+        self.path = path
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')  # 한 프로세스가 쓰는 동안에도 다른 프로세스가 읽을 수 있도록 함
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """
+        :param key: str, 키
+        :return: bytes 또는 None, 만료되지 않은 값
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT value FROM entries WHERE key = ? AND expires_at > ?',
+                               (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl):
+        """
+        :param key: str, 키
+        :param value: bytes, 값
+        :param ttl: float, 유효 시간(초)
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?)', (key, value, now + ttl))
+            conn.execute('DELETE FROM entries WHERE expires_at <= ?', (now,))
+
+    def add(self, key, value, ttl):
+        """
+        키가 없거나 만료된 경우에만 값을 넣는 함수 (잠금용)
+        :return: bool, 값을 넣었는지 여부
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT INTO entries VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE '
+                'SET value = excluded.value, expires_at = excluded.expires_at WHERE entries.expires_at <= ?',
+                (key, value, now + ttl, now))
+            return cursor.rowcount == 1
+
+    def release(self, key, value):
+        """
+        키의 값이 value일 때만 지우는 함수 (자기가 잡은 잠금만 풂)
+        """
+        with self._connect() as conn:
+            conn.execute('DELETE FROM entries WHERE key = ? AND value = ?', (key, value))
+
+
+class RedisBackend:
+    """
+    여러 호스트가 공유하는 Redis 저장소
+    """
+
+    # 값이 같을 때만 지우는 스크립트 (다른 프로세스가 새로 잡은 잠금을 지우지 않도록 함)
+    _RELEASE = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+
+    def __init__(self, url):
+        """
+        :param url: str, redis:// 주소
+        """
+        import redis  # 공유 캐시를 Redis로 쓸 때만 필요함
+
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, value, ttl):
+        self.client.set(key, value, px=int(ttl * 1000))
+
+    def add(self, key, value, ttl):
+        return bool(self.client.set(key, value, nx=True, px=int(ttl * 1000)))
+
+    def release(self, key, value):
+        self.client.eval(self._RELEASE, 1, key, value)
+
+
+class SharedCache:
+    """
+    공유 저장소 위에서 갱신 주기마다 한 프로세스만 계산하도록 하는 캐시 (TTLCache와 같은 get_or_load 형태)
+    """
+
+    def __init__(self, backend):
+        """
+        :param backend: object, get / set / add / release를 가진 저장소 (SQLiteBackend, RedisBackend 등)
+        """
+        self.backend = backend
+        self._local = TTLCache(maxsize=32)  # 같은 프로세스의 동시 요청은 저장소 조회 / 계산을 한 번만 함
+
+    @staticmethod
+    def _name(key):
+        return 'fx:' + hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def get_or_load(self, key, loader, ttl, cacheable=None):
+        """
+        공유 저장소에 유효한 값이 있으면 반환하고, 없으면 한 프로세스만 loader를 호출해 채우는 함수
+        :param key: hashable, 캐시 키 (repr이 프로세스마다 같아야 함)
+        :param loader: callable, 인자 없이 호출되어 값을 반환하는 함수 (반환값은 pickle 가능해야 함)
+        :param ttl: float, 값의 유효 시간(초)
+        :param cacheable: callable, 값을 받아 공유할지 여부를 반환하는 함수 (None이면 항상 공유, 공유하지 않는 값은 프로세스 안에도 남기지 않음)
+        :return: object, 캐시된 값
+        """
+        return self._local.get_or_load(key, lambda: self._load(key, loader, ttl, cacheable), min(ttl, LOCAL_TTL),
+                                       cacheable)
+
+    def _load(self, key, loader, ttl, cacheable):
+        name = self._name(key)
+        deadline = time.monotonic() + LOCK_WAIT
+        while True:
+            # 값은 (유효 기한, 값)으로 저장하고, 만료 뒤에도 ttl만큼 남겨 갱신 중에 다른 프로세스가 쓸 수 있도록 함
+            entry = self.backend.get(name)
+            fresh_until, value = pickle.loads(entry) if entry is not None else (0, None)
+            if fresh_until > time.time():
+                return value
+
+            token = uuid.uuid4().hex.encode()
+            if self.backend.add(name + ':lock', token, LOCK_TTL):
+                try:
+                    # 확인한 뒤 잠금을 잡기 전에 다른 프로세스가 갱신을 끝냈을 수 있으므로 다시 확인함
+                    latest = self.backend.get(name)
+                    if latest is not None:
+                        fresh_until, latest_value = pickle.loads(latest)
+                        if fresh_until > time.time():
+                            return latest_value
+                    value = loader()
+                    if cacheable is None or cacheable(value):
+                        self.backend.set(name, pickle.dumps((time.time() + ttl, value)), ttl * 2)
+                    return value
+                finally:
+                    self.backend.release(name + ':lock', token)
+
+            # 다른 프로세스가 갱신 중 - 이전 값이 있으면 그 값을 쓰고, 없으면 잠시 기다렸다가 다시 확인
+            if entry is not None:
+                return value
+            if time.monotonic() > deadline:
+                return loader()
+            time.sleep(POLL_INTERVAL)
+
+
+def get_cache():
+    """
+    SHARED_CACHE 설정에 맞는 프로세스 전역 공유 캐시를 반환하는 함수
+    :return: SharedCache 또는 None, 설정하지 않았으면 None
+    """
+    global _cache
+    if not SHARED_CACHE:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            if SHARED_CACHE.startswith('redis://') or SHARED_CACHE.startswith('rediss://'):
+                backend = RedisBackend(SHARED_CACHE)
+            elif SHARED_CACHE == 'sqlite':
+                backend = SQLiteBackend(SHARED_CACHE_PATH)
+            elif SHARED_CACHE.startswith('sqlite:///'):
+                backend = SQLiteBackend(SHARED_CACHE[len('sqlite:///'):])
+            else:
+                raise ValueError(f"알 수 없는 SHARED_CACHE 설정입니다: {SHARED_CACHE}")
+            _cache = SharedCache(backend)
+    return _cache
+
+
+def cached(key, loader, ttl, cacheable=None):
+    """
+    공유 캐시를 쓰도록 설정되어 있으면 공유 캐시를 거치고, 아니면 loader를 바로 호출하는 함수
+    :param key: hashable, 캐시 키
+    :param loader: callable, 인자 없이 호출되어 값을 반환하는 함수
+    :param ttl: float, 값의 유효 시간(초)
+    :param cacheable: callable, 값을 받아 공유할지 여부를 반환하는 함수
+    :return: object, 값
+    """
+    cache = get_cache()
+    if cache is None:
+        return loader()
+    return cache.get_or_load(key, loader, ttl, cacheable)
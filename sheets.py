@@ -0,0 +1,290 @@
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+import profiling
+import shared_cache
+import sources
+from market_cache import TTLCache
+
+# 서비스 계정 JSON 파일 경로
+SERVICE_ACCOUNT_FILE = 'dollainvestingtool-1a7b13d623dd.json'
+
+# 스프레드시트 ID와 API 범위
+SPREADSHEET_ID = '1iw-NdSsOOg63Q3dOQWVdY6FzW1fOuYGkIuX1Wx-wy0Q'
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+
+# 로컬 가짜 Sheets 서버 주소 (설정하면 인증 없이 해당 주소로 요청, 예: http://localhost:8765/)
+SHEETS_ENDPOINT = os.environ.get('SHEETS_ENDPOINT')
+
+# 요청 하나의 소켓 제한 시간(초) - 응답이 멈춰도 작업 스레드가 끝나도록 fetcher의 sheets 제한 시간보다 짧게 둠
+REQUEST_TIMEOUT = 10
+
+# 시트 원본 값을 다시 읽기 전까지 재사용하는 시간(초) - 수집기가 한 시간에 한 번 행을 추가함
+VALUES_TTL = 60
+
+# 데이터 이름 -> (시트 이름, 첫 열, 마지막 열)
+RANGES = {
+    'jpy_trend': ('엔_4주_환율만', 'A', 'F'),
+    'jpy_history': ('엔_4주', 'A', 'F'),
+    'usd_trend': ('달러_4주_환율만', 'A', 'F'),
+    'usd_history': ('달러_4주', 'A', 'F'),
+}
+
+# 화면에서 보여주는 최대 행 수 (시간 단위 약 3개월, 원엔 추세 차트)
+TREND_ROWS = 24 * 92
+
+# 데이터 이름 -> 끝에서부터 읽고 변환하는 행 수 (화면에서 실제로 그리는 만큼만 읽음)
+# 원엔 추세는 차트 최대 행 수, 원엔 기록은 표 최대 행 수 (표는 줄여서 보낼 수 없으므로 차트보다 적게 둠),
+# 원달러는 24시간 차트 / 표
+TAIL_ROWS = {
+    'jpy_trend': TREND_ROWS,
+    'jpy_history': 200,
+    'usd_trend': 24,
+    'usd_history': 24,
+}
+
+# 데이터가 시작하는 행 번호 (1행은 머리글)
+FIRST_ROW = 2
+
+# 마지막으로 확인한 데이터 행 뒤로 더 요청하는 행 수 - 그 사이 수집기가 추가한 행을 같은 요청으로 받음
+TAIL_SLACK = 48
+
+# 시트 격자 크기(행 수)를 다시 묻기 전까지 재사용하는 시간(초) - 마지막 행 위치를 처음 찾을 때만 사용
+ROW_COUNT_TTL = 60
+
+_service = None
+_service_lock = threading.Lock()
+_values_cache = TTLCache(maxsize=8)
+_grid_cache = TTLCache(maxsize=1)
+_row_ends = {}  # 데이터 이름 -> 마지막으로 확인한 데이터 행 번호
+_row_ends_lock = threading.Lock()
+_parsed = {}  # 데이터 이름 -> (원본 값 지문, 데이터프레임)
+_parsed_lock = threading.Lock()
+
+
+def get_service():
+    """
+    프로세스 전체에서 한 번만 만드는 Sheets API 클라이언트를 반환하는 함수
+    httplib2.Http는 스레드 안전하지 않으므로 요청마다 새 연결 객체를 사용하도록 구성함
+    구글 클라이언트 라이브러리는 처음 호출할 때 불러옴 (화면 시작을 늦추지 않도록 함)
+    :return: Resource, Sheets API 클라이언트
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            import google_auth_httplib2
+            import httplib2
+            from google.auth.credentials import AnonymousCredentials
+            from google.oauth2 import service_account
+            from googleapiclient.discovery import build
+            from googleapiclient.http import HttpRequest
+
+            if SHEETS_ENDPOINT:
+                creds = AnonymousCredentials()
+                client_options = {'api_endpoint': SHEETS_ENDPOINT}
+            else:
+                creds = service_account.Credentials.from_service_account_file(
+                    SERVICE_ACCOUNT_FILE, scopes=SCOPES)
+                client_options = None
+
+            def build_request(http, *args, **kwargs):
+                new_http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=REQUEST_TIMEOUT))
+                return HttpRequest(new_http, *args, **kwargs)
+
+            _service = build(
+                'sheets', 'v4',
+                http=google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=REQUEST_TIMEOUT)),
+                requestBuilder=build_request,
+                client_options=client_options,
+                cache_discovery=False)
+    return _service
+
+
+def batch_get(ranges):
+    """
+    여러 범위를 한 번의 batchGet 요청으로 읽는 함수
+    :param ranges: list, 스프레드시트 범위 목록
+    :return: list, 범위 순서대로 정렬된 행 목록들
+    """
+    ranges = list(ranges)
+
+    def request():
+        # 숫자는 표시 형식(쉼표 등)이 붙은 문자열 대신 숫자 그대로 받음 - 날짜는 문자열로 받음
+        response = get_service().spreadsheets().values().batchGet(
+            spreadsheetId=SPREADSHEET_ID, ranges=ranges,
+            valueRenderOption='UNFORMATTED_VALUE', dateTimeRenderOption='FORMATTED_STRING').execute()
+        return [value_range.get('values', []) for value_range in response.get('valueRanges', [])]
+
+    return sources.sheets_batch_get(ranges, request)
+
+
+def a1_range(name, first, last=None, last_column=None):
+    """
+    데이터 이름의 행 범위를 A1 표기로 만드는 함수
+    :param name: str, 데이터 이름 (RANGES의 키)
+    :param first: int, 첫 행 번호
+    :param last: int, 마지막 행 번호 (None이면 시트 끝까지)
+    :param last_column: str, 마지막 열 (None이면 RANGES의 마지막 열)
+    :return: str, 스프레드시트 범위
+    """
+    sheet, first_column, default_last_column = RANGES[name]
+    return f"{sheet}!{first_column}{first}:{last_column or default_last_column}{'' if last is None else last}"
+
+
+def grid_row_counts():
+    """
+    시트별 격자 행 수(빈 행 포함)를 반환하는 함수 (ROW_COUNT_TTL 동안 재사용)
+    :return: dict, 시트 이름 -> 행 수
+    """
+    def request():
+        response = get_service().spreadsheets().get(
+            spreadsheetId=SPREADSHEET_ID, fields='sheets.properties(title,gridProperties.rowCount)').execute()
+        return {sheet['properties']['title']: sheet['properties']['gridProperties']['rowCount']
+                for sheet in response.get('sheets', [])}
+
+    return _grid_cache.get_or_load('grid', lambda: sources.sheets_grid(request), ROW_COUNT_TTL)
+
+
+def _count_rows(name):
+    # 첫 열만 끝까지 읽어서 마지막 데이터 행 번호를 구함 (위치를 모르거나 놓쳤을 때만 사용)
+    first_column = RANGES[name][1]
+    rows = batch_get([a1_range(name, FIRST_ROW, last_column=first_column)])[0]
+    return FIRST_ROW + len(rows) - 1
+
+
+def read_tails(names, limit=None):
+    """
+    시트마다 마지막 limit개 데이터 행만 읽는 함수
+    마지막 데이터 행 위치를 기억해 두고 그 앞 limit개 ~ 뒤 TAIL_SLACK개 행의 닫힌 범위만 요청하므로,
+    시트가 계속 길어져도 요청 크기가 일정함 (응답 끝의 빈 행은 생략되므로 응답 길이로 새 위치를 알 수 있음)
+    :param names: list, 데이터 이름 목록 (RANGES의 키)
+    :param limit: int, 시트마다 읽을 행 수 (None이면 데이터 이름별 TAIL_ROWS)
+    :return: list, 이름 순서대로 정렬된 행 목록들 (시간순)
+    """
+    limits = {name: limit or TAIL_ROWS[name] for name in names}
+    with _row_ends_lock:
+        ends = {name: _row_ends.get(name) for name in names}
+    if any(end is None for end in ends.values()):
+        # 처음에는 격자 행 수를 마지막 행으로 가정 (격자 뒤쪽이 비어 있으면 아래에서 다시 읽음)
+        grid = grid_row_counts()
+        for name in names:
+            if ends[name] is None:
+                ends[name] = grid.get(RANGES[name][0], FIRST_ROW)
+
+    def window(name, end):
+        return max(FIRST_ROW, end - limits[name] + 1), end + TAIL_SLACK
+
+    windows = {name: window(name, ends[name]) for name in names}
+    values = batch_get([a1_range(name, *windows[name]) for name in names])
+
+    tails = []
+    for name, rows in zip(names, values):
+        first, last = windows[name]
+        if len(rows) == last - first + 1 or (not rows and first > FIRST_ROW):
+            # 요청 범위가 꽉 찼거나(그 뒤에 행이 더 있을 수 있음) 범위 전체가 데이터 뒤쪽이면 위치를 다시 구함
+            end = _count_rows(name)
+            first, last = window(name, end)
+            rows = batch_get([a1_range(name, first, last)])[0]
+        end = first + len(rows) - 1
+        if len(rows) < limits[name] and first > FIRST_ROW:
+            # 가정한 마지막 행이 실제보다 뒤였음 - 확인한 위치로 한 번 더 읽음
+            first, last = window(name, end)
+            rows = batch_get([a1_range(name, first, last)])[0]
+            end = first + len(rows) - 1
+        with _row_ends_lock:
+            _row_ends[name] = end
+        tails.append(rows[-limits[name]:])
+    return tails
+
+
+# 데이터 이름 -> (시트 행 안의 열 위치, 컬럼 이름, 타입) 목록
+# 'date'는 datetime64, 'float'는 float64 배열로 바로 변환함 (문자열로 된 표시 형식은 화면에서 그릴 때 만듦)
+COLUMNS = {
+    'jpy_trend': [(0, '현재날짜', 'date'), (1, '적정원엔환율', 'float'), (2, '현재원엔환율', 'float')],
+    'jpy_history': [(0, '현재날짜', 'date'), (2, '적정원엔환율', 'float'), (5, '현재원엔환율', 'float')],
+    'usd_trend': [(0, '적정원달러환율', 'float'), (1, '현재원달러환율', 'float')],
+    'usd_history': [(0, '현재날짜', 'date'), (2, '적정원달러', 'float'), (5, '현재원달러환율', 'float')],
+}
+
+# 시트의 날짜 형식 (다른 형식이 섞여 있으면 자동 인식으로 다시 변환)
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _to_dates(values):
+    try:
+        return pd.to_datetime(values, format=DATE_FORMAT)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, errors='coerce')
+
+
+def to_frame(name, rows, limit=TREND_ROWS):
+    """
+    시트 행 목록의 마지막 limit개 행을 타입이 정해진 컬럼 배열로 변환하는 함수
+    :param name: str, 데이터 이름 (COLUMNS의 키)
+    :param rows: list, 시트 행 목록 (시간순, 끝의 빈 칸은 생략될 수 있음)
+    :param limit: int, 변환할 최대 행 수 (None이면 전체)
+    :return: DataFrame, 시간순으로 정렬된 데이터프레임
+    """
+    if limit is not None:
+        rows = rows[-limit:]
+    data = {}
+    for position, column, kind in COLUMNS[name]:
+        values = [row[position] if position < len(row) else None for row in rows]
+        if kind == 'date':
+            data[column] = _to_dates(values)
+        else:
+            data[column] = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype='float64')
+    return pd.DataFrame(data)
+
+
+def parse(name, rows):
+    """
+    시트 행 목록을 데이터 이름에 맞는 데이터프레임으로 변환하는 함수
+    변환할 마지막 행들과 전체 행 수가 바뀌지 않았으면 이전에 변환한 결과를 재사용함
+    :param name: str, 데이터 이름 (RANGES의 키)
+    :param rows: list, 시트 행 목록
+    :return: DataFrame, 변환된 데이터프레임 (복사본)
+    """
+    tail = rows[-TAIL_ROWS.get(name, TREND_ROWS):]
+    fingerprint = hashlib.sha1(json.dumps([len(rows), tail], ensure_ascii=False, default=str).encode()).hexdigest()
+    with _parsed_lock:
+        entry = _parsed.get(name)
+    if entry is None or entry[0] != fingerprint:
+        entry = (fingerprint, to_frame(name, tail, None))
+        with _parsed_lock:
+            _parsed[name] = entry
+    return entry[1].copy()
+
+
+def read_frames(names):
+    """
+    여러 데이터의 마지막 행들을 한 번의 batchGet으로 읽어 데이터프레임으로 반환하는 함수
+    :param names: list, 데이터 이름 목록 (RANGES의 키)
+    :return: dict, 데이터 이름 -> DataFrame
+    """
+    names = tuple(names)
+
+    def read():
+        with profiling.stage('sheets.read_tails'):
+            return read_tails(names)
+
+    def load():
+        # 여러 레플리카가 떠 있으면 한 프로세스만 시트를 읽고 나머지는 그 값을 씀 (Sheets 클라이언트도 만들지 않음)
+        return shared_cache.cached(('sheets.read_tails', names), read, VALUES_TTL)
+
+    values = _values_cache.get_or_load(names, load, VALUES_TTL)
+    with profiling.stage('sheets.parse'):
+        return {name: parse(name, rows) for name, rows in zip(names, values)}
+
+
+def empty_frames(names):
+    """
+    읽기에 실패했을 때 화면 구성을 위해 빈 데이터프레임을 만드는 함수
+    :param names: list, 데이터 이름 목록
+    :return: dict, 데이터 이름 -> 빈 DataFrame
+    """
+    return {name: to_frame(name, []) for name in names}
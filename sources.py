@@ -0,0 +1,234 @@
+"""
+외부 데이터 소스(야후파이낸스, 구글 스프레드시트, 인베스팅닷컴) 호출을 한 곳에서 처리하는 계층
+
+DATA_SOURCE 환경 변수로 동작을 고름
+- 'live' (기본값): 실제 서비스에 요청
+- 'record': 실제 서비스에 요청하고 응답을 RECORD_DIR에 저장 (같은 대상은 새 응답과 합쳐서 저장)
+- 'replay': 네트워크 없이 RECORD_DIR의 응답을 REPLAY_LATENCY만큼 기다린 뒤 돌려줌 (부하 테스트 / 측정용)
+
+저장 단위
+- 야후파이낸스: (티커, 봉 간격)별 시세 - 요청한 티커 묶음과 기간에 맞춰 잘라서 돌려줌
+- 스프레드시트: 시트별 행 번호 -> 행 - 어떤 행 범위를 요청해도 실제 API처럼 응답함
+- 인베스팅닷컴: URL별 마지막 페이지 본문
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+DATA_SOURCE = os.environ.get('DATA_SOURCE', 'live')
+
+# 녹화한 응답을 저장하는 디렉터리
+RECORD_DIR = os.environ.get('RECORD_DIR', 'recordings')
+
+# 재생할 때 응답마다 기다리는 시간(초) - 모든 소스에 같은 값('0.2') 또는 소스별 값('yahoo=0.5,sheets=0.2,investing=0.3')
+REPLAY_LATENCY = os.environ.get('REPLAY_LATENCY', '0')
+
+_record_lock = threading.Lock()
+
+
+def latency(source):
+    """
+    소스의 재생 지연 시간을 반환하는 함수
+    :param source: str, 데이터 소스 이름 ('yahoo', 'sheets', 'investing')
+    :return: float, 지연 시간(초)
+    """
+    if '=' not in REPLAY_LATENCY:
+        return float(REPLAY_LATENCY)
+    values = dict(part.split('=', 1) for part in REPLAY_LATENCY.split(',') if part)
+    return float(values.get(source, 0))
+
+
+def _path(source, key):
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return os.path.join(RECORD_DIR, f'{source}-{digest}.pkl')
+
+
+def load(source, key):
+    """
+    녹화된 값을 읽는 함수
+    :param source: str, 데이터 소스 이름
+    :param key: object, 녹화 대상 (repr이 같으면 같은 대상)
+    :return: object, 녹화된 값
+    :raises LookupError: 녹화된 값이 없는 경우
+    """
+    try:
+        with open(_path(source, key), 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        raise LookupError(f"녹화된 {source} 응답이 없습니다: {key}") from None
+
+
+def save(source, key, value):
+    """
+    값을 녹화하는 함수 (다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 바꿔치기)
+    :param source: str, 데이터 소스 이름
+    :param key: object, 녹화 대상
+    :param value: object, 저장할 값 (pickle 가능해야 함)
+    """
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    path = _path(source, key)
+    temp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp, 'wb') as f:
+        pickle.dump(value, f)
+    os.replace(temp, path)
+
+
+def _load_or(source, key, default):
+    try:
+        return load(source, key)
+    except LookupError:
+        return default
+
+
+def _replay(source, key):
+    time.sleep(latency(source))
+    return load(source, key)
+
+
+def yahoo_download(tickers, start, end, interval):
+    """
+    yf.download와 같은 인자/결과의 시세 다운로드 함수 (market_data의 기본 다운로더)
+    :param tickers: str 또는 list, 티커 하나 또는 티커 목록
+    :param start: datetime, 시작 시각
+    :param end: datetime, 끝 시각
+    :param interval: str, 봉 간격
+    :return: DataFrame, 시세 데이터 (티커 목록이면 (Price, Ticker) 2단 컬럼)
+    """
+    import pandas as pd
+
+    from bar_store import select_ticker
+
+    names = [tickers] if isinstance(tickers, str) else list(tickers)
+    if DATA_SOURCE == 'replay':
+        time.sleep(latency('yahoo'))
+        frames = {}
+        for ticker in names:
+            data = _load_or('yahoo', (ticker, interval), None)
+            if data is None:
+                continue
+            index = data.index if data.index.tz is not None else data.index.tz_localize('UTC')
+            frames[ticker] = data[(index >= pd.Timestamp(start)) & (index <= pd.Timestamp(end))]
+        if not frames:
+            return pd.DataFrame()
+        if isinstance(tickers, str):
+            return frames[tickers]
+        return pd.concat(frames, axis=1).swaplevel(axis=1)
+
+    import yfinance as yf  # 처음 다운로드할 때 불러옴 (화면 시작을 늦추지 않도록 함)
+    data = yf.download(tickers, start=start, end=end, interval=interval)
+    if DATA_SOURCE == 'record' and data is not None and not data.empty:
+        with _record_lock:
+            for ticker in names:
+                part = data if isinstance(tickers, str) else select_ticker(data, ticker)
+                if part is None or part.empty:
+                    continue
+                if isinstance(part.columns, pd.MultiIndex):
+                    part = part.copy()
+                    part.columns = part.columns.get_level_values(0)
+                old = _load_or('yahoo', (ticker, interval), None)
+                if old is not None:
+                    part = pd.concat([old, part])
+                    part = part[~part.index.duplicated(keep='last')].sort_index()
+                save('yahoo', (ticker, interval), part)
+    return data
+
+
+class ReplayResponse:
+    """
+    녹화된 페이지를 돌려주는 requests.Response 대용 객체 (fetch_quote가 쓰는 속성만 가짐)
+    """
+    status_code = 200
+
+    def __init__(self, content, headers):
+        self.content = content
+        self.headers = headers
+
+    def raise_for_status(self):
+        pass
+
+
+def http_get(session, url, headers=None, timeout=None):
+    """
+    페이지를 요청하는 함수 (quotes.fetch_quote에서 사용)
+    :param session: requests.Session, 사용할 세션 (재생 모드에서는 사용하지 않음)
+    :param url: str, 페이지 주소
+    :param headers: dict, 요청 헤더
+    :param timeout: tuple, (연결, 응답) 제한 시간(초)
+    :return: requests.Response 또는 ReplayResponse, 응답
+    """
+    if DATA_SOURCE == 'replay':
+        content, response_headers = _replay('investing', url)
+        return ReplayResponse(content, response_headers)
+    response = session.get(url, headers=headers, timeout=timeout)
+    if DATA_SOURCE == 'record' and response.status_code == 200:
+        save('investing', url, (response.content, dict(response.headers)))
+    return response
+
+
+def _record_sheet_ranges(ranges, values):
+    # 응답을 시트별 행 번호 -> 행으로 합쳐서 저장 (응답 끝의 빈 행은 생략되므로 짧으면 그 뒤로는 데이터가 없음)
+    import fake_sheets
+
+    with _record_lock:
+        recorded = _load_or('sheets', 'rows', {})
+        for range_name, rows in zip(ranges, values):
+            sheet, first, last = fake_sheets.parse_range(range_name)[:3]
+            entry = recorded.setdefault(sheet, {'rows': {}, 'end': None})
+            for offset, row in enumerate(rows):
+                number = first + offset
+                if len(row) >= len(entry['rows'].get(number, [])):
+                    entry['rows'][number] = row
+            if last is None or len(rows) < last - first + 1:
+                entry['end'] = first + len(rows) - 1
+                for number in [number for number in entry['rows'] if number > entry['end']]:
+                    del entry['rows'][number]
+        save('sheets', 'rows', recorded)
+
+
+def _replay_sheet_ranges(ranges):
+    import fake_sheets
+
+    recorded = _replay('sheets', 'rows')
+    sheets = {}
+    for sheet, entry in recorded.items():
+        end = entry['end'] if entry['end'] is not None else max(entry['rows'], default=1)
+        sheets[sheet] = [entry['rows'].get(number, []) for number in range(1, end + 1)]
+    fake = fake_sheets.FakeSheets(sheets)
+    return [fake.get(range_name).get('values', []) for range_name in ranges]
+
+
+def sheets_batch_get(ranges, request):
+    """
+    스프레드시트 여러 범위를 읽는 함수 (sheets.batch_get에서 사용)
+    :param ranges: list, 스프레드시트 범위 목록
+    :param request: callable, 실제 batchGet을 실행해 범위 순서대로 행 목록들을 반환하는 함수
+    :return: list, 범위 순서대로 정렬된 행 목록들
+    """
+    if DATA_SOURCE == 'replay':
+        return _replay_sheet_ranges(ranges)
+    values = request()
+    if DATA_SOURCE == 'record':
+        _record_sheet_ranges(ranges, values)
+    return values
+
+
+def sheets_grid(request):
+    """
+    시트별 격자 행 수를 읽는 함수 (sheets.grid_row_counts에서 사용)
+    :param request: callable, 실제 조회를 실행해 시트 이름 -> 행 수를 반환하는 함수
+    :return: dict, 시트 이름 -> 행 수
+    """
+    if DATA_SOURCE == 'replay':
+        time.sleep(latency('sheets'))
+        recorded = _load_or('sheets', 'grid', None)
+        if recorded is None:
+            # 격자 크기를 녹화하지 못했으면 녹화된 마지막 행을 격자 크기로 사용
+            rows = load('sheets', 'rows')
+            recorded = {sheet: entry['end'] or max(entry['rows'], default=1) for sheet, entry in rows.items()}
+        return recorded
+    grid = request()
+    if DATA_SOURCE == 'record':
+        save('sheets', 'grid', grid)
+    return grid
@@ -0,0 +1,264 @@
+"""
+새 봉이 들어올 때마다 지표를 처음부터 다시 계산하지 않고 갱신하는 스트리밍 지표
+
+- 평균: 누적 합 (값을 넣고 뺄 때 O(1))
+- 중앙값: 두 개의 힙 + 지연 삭제 (값을 넣고 뺄 때 O(log n))
+- 기간 밖으로 나간 값은 시간 순서대로 앞에서부터 제거
+
+indicators.sweep과 같은 값을 내도록 거래일 단위 갭 비율(align)의 짝짓기 규칙을 그대로 따름
+"""
+import heapq
+from collections import deque
+
+import pandas as pd
+
+import indicators
+
+
+class RollingMedian:
+    """
+    값을 넣고 임의의 값을 빼면서 중앙값을 구하는 구조 (아래쪽 절반은 최대 힙, 위쪽 절반은 최소 힙)
+    빼는 값은 바로 지우지 않고 힙 꼭대기에 올라왔을 때 지움 (지연 삭제)
+    """
+
+    def __init__(self):
+        self._low = []  # 부호를 바꿔 넣은 최대 힙
+        self._high = []
+        self._low_size = 0  # 지연 삭제 대기 값을 뺀 실제 개수
+        self._high_size = 0
+        self._delayed = {}
+
+    def __len__(self):
+        return self._low_size + self._high_size
+
+    def _prune(self, heap, sign):
+        while heap:
+            value = sign * heap[0]
+            if self._delayed.get(value, 0) == 0:
+                break
+            self._delayed[value] -= 1
+            if self._delayed[value] == 0:
+                del self._delayed[value]
+            heapq.heappop(heap)
+
+    def _rebalance(self):
+        # 아래쪽 절반이 위쪽보다 0개 또는 1개 많도록 유지
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, -1)
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._low_size += 1
+            self._high_size -= 1
+            self._prune(self._high, 1)
+
+    def add(self, value):
+        if not self._low or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._rebalance()
+
+    def remove(self, value):
+        self._delayed[value] = self._delayed.get(value, 0) + 1
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, -1)
+        else:
+            self._high_size -= 1
+            if self._high and value == self._high[0]:
+                self._prune(self._high, 1)
+        self._rebalance()
+
+    def median(self):
+        if not len(self):
+            return float('nan')
+        if self._low_size > self._high_size:
+            return float(-self._low[0])
+        return (-self._low[0] + self._high[0]) / 2
+
+
+class RollingWindow:
+    """
+    시각 순서대로 들어오는 값의 기간 내 평균과 중앙값을 유지하는 창
+    """
+
+    def __init__(self, length):
+        """
+        :param length: Timedelta, 기간 길이
+        """
+        self.length = length
+        self._items = deque()  # (시각, 값)
+        self._sum = 0.0
+        self._median = RollingMedian()
+        self._updates = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def last(self):
+        return self._items[-1] if self._items else None
+
+    def _add(self, value):
+        self._sum += value
+        self._median.add(value)
+
+    def _remove(self, value):
+        self._sum -= value
+        self._median.remove(value)
+        # 더하고 빼기를 반복하며 쌓이는 부동소수점 오차를 없애기 위해 가끔 합을 새로 구함 (평균 O(1))
+        self._updates += 1
+        if self._updates >= len(self._items) + 1:
+            self._sum = sum(item[1] for item in self._items)
+            self._updates = 0
+
+    def push(self, ts, value):
+        """
+        값을 추가하는 함수 (마지막 값과 시각이 같으면 진행 중인 봉의 갱신으로 보고 값을 바꿈)
+        :param ts: Timestamp, 시각
+        :param value: float, 값
+        """
+        value = float(value)
+        if self._items and ts == self._items[-1][0]:
+            _, old = self._items.pop()
+            self._remove(old)
+        elif self._items and ts < self._items[-1][0]:
+            raise ValueError(f"{ts}는 마지막 시각 {self._items[-1][0]}보다 이전입니다")
+        self._items.append((ts, value))
+        self._add(value)
+
+    def evict(self, now):
+        """
+        기간 시작 시각(now - length)보다 오래된 값을 제거하는 함수
+        :param now: Timestamp, 기준 시각
+        """
+        cutoff = now - self.length
+        while self._items and self._items[0][0] < cutoff:
+            _, value = self._items.popleft()
+            self._remove(value)
+
+    def mean(self):
+        return self._sum / len(self._items) if self._items else float('nan')
+
+    def median(self):
+        return self._median.median()
+
+    def last_before(self, ts):
+        # ts보다 이전의 마지막 값 (끝에서부터 찾으므로 최근 시각이면 몇 걸음 안에 끝남)
+        for item in reversed(self._items):
+            if item[0] < ts:
+                return item
+        return None
+
+
+class StreamingIndicators:
+    """
+    통화쌍 하나의 분석 기간 지표를 봉 단위로 갱신하는 객체
+    """
+
+    def __init__(self, weeks, invert=False, precision=2):
+        """
+        :param weeks: int, 분석 기간(주)
+        :param invert: bool, 환율 시세의 역수를 원화 환율로 쓰는지 여부
+        :param precision: int, 환율 소수점 자리수
+        """
+        self.invert = invert
+        self.precision = precision
+        length = pd.Timedelta(weeks=weeks)
+        self.index = RollingWindow(length)
+        self.quote = RollingWindow(length)
+        self.ratio = RollingWindow(length)  # 거래일 -> 갭 비율 (평균만 사용)
+        self.previous_quote = None
+        self._session = None  # 아직 짝지을 환율이 바뀔 수 있는 마지막 거래일 (시각, 지수)
+
+    @classmethod
+    def from_history(cls, index_close, quote_close, weeks, invert=False, precision=2):
+        """
+        과거 데이터를 시각 순서대로 넣어 초기 상태를 만드는 함수
+        :param index_close: Series, 기준 지수 일봉 종가 (UTC 인덱스)
+        :param quote_close: Series, 환율 시간봉 종가 (UTC 인덱스)
+        :return: StreamingIndicators, 초기화된 객체
+        """
+        streaming = cls(weeks, invert, precision)
+        streaming.update(index_close, quote_close)
+        return streaming
+
+    def update(self, index_close, quote_close):
+        """
+        이미 넣은 마지막 봉 이후(마지막 봉 포함)의 데이터만 시각 순서대로 넣는 함수
+        :param index_close: Series, 기준 지수 일봉 종가 (UTC 인덱스)
+        :param quote_close: Series, 환율 시간봉 종가 (UTC 인덱스)
+        """
+        index_close = index_close.dropna()
+        quote_close = quote_close.dropna()
+        if self.index.last() is not None:
+            index_close = index_close[index_close.index >= self.index.last()[0]]
+        if self.quote.last() is not None:
+            quote_close = quote_close[quote_close.index >= self.quote.last()[0]]
+        events = pd.concat([
+            pd.DataFrame({'kind': 0, 'value': index_close}),
+            pd.DataFrame({'kind': 1, 'value': quote_close}),
+        ]).sort_index(kind='stable')
+        for ts, kind, value in zip(events.index, events['kind'], events['value']):
+            if kind == 0:
+                self.add_index(ts, value)
+            else:
+                self.add_quote(ts, value)
+
+    def _pair(self, session, index_value, quote):
+        # align과 같은 규칙: 거래일이 끝나기 전(session_end 미만), MAX_QUOTE_AGE 이내의 마지막 환율과 짝지음
+        session_end = session + indicators.SESSION_LENGTH
+        if quote is None or quote[0] >= session_end or session_end - quote[0] > indicators.MAX_QUOTE_AGE:
+            return
+        fx = 1 / quote[1] if self.invert else quote[1]
+        self.ratio.push(session, index_value / fx)
+
+    def add_index(self, ts, close):
+        """
+        기준 지수 일봉을 추가하거나 진행 중인 일봉을 갱신하는 함수
+        :param ts: Timestamp, 거래일 (UTC)
+        :param close: float, 종가
+        """
+        self.index.push(ts, close)
+        self._session = (ts, float(close))
+        self._pair(ts, float(close), self.quote.last_before(ts + indicators.SESSION_LENGTH))
+
+    def add_quote(self, ts, close):
+        """
+        환율 시간봉을 추가하거나 진행 중인 시간봉을 갱신하는 함수 - O(log n)
+        :param ts: Timestamp, 봉 시각 (UTC)
+        :param close: float, 종가
+        """
+        last = self.quote.last()
+        if last is not None and ts != last[0]:
+            self.previous_quote = last[1]  # 새 봉이 시작되면 직전 봉 종가를 기억
+        self.quote.push(ts, close)
+        if self._session is not None:
+            session, index_value = self._session
+            if ts >= session + indicators.SESSION_LENGTH:
+                self._session = None  # 거래일이 끝나서 갭 비율이 확정됨
+            else:
+                self._pair(session, index_value, (ts, float(close)))
+
+    def values(self, now=None):
+        """
+        현재 상태의 지표와 조건을 계산하는 함수 (indicators.sweep 한 행과 같은 값)
+        :param now: Timestamp, 기간의 기준 시각 (기본값: 현재 시각)
+        :return: dict, 지표 이름 -> 값
+        """
+        now = now or pd.Timestamp.now(tz='UTC')
+        for window in (self.index, self.quote, self.ratio):
+            window.evict(now)
+        values = indicators.derive(
+            self.index.last()[1], self.quote.last()[1],
+            self.index.median(), self.quote.median(),
+            self.index.mean(), self.quote.mean(),
+            self.ratio.mean(), self.invert, self.precision)
+        previous = self.previous_quote
+        values['previous_fx'] = round(1 / previous, self.precision) if self.invert else round(previous, self.precision)
+        return {name: value.item() if hasattr(value, 'item') else value for name, value in values.items()}
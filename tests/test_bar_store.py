@@ -0,0 +1,118 @@
+"""
+가짜 다운로더로 봉 저장소(bar_store.BarStore)가 비어 있는 구간만 받는지 확인하는 테스트
+"""
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from bar_store import COLUMNS, BarStore
+
+
+class StubDownloader:
+    """
+    요청 구간의 1시간 봉을 만들어 돌려주고 호출 인자를 기록하는 가짜 다운로더 (yf.download와 같은 형태)
+    """
+
+    def __init__(self, listed_at=None):
+        """
+        :param listed_at: datetime, 이 시각 전에는 봉이 없음 (상장 전)
+        """
+        self.listed_at = listed_at
+        self.calls = []
+        self.failing = False
+
+    def bars(self, start, end):
+        if self.failing:
+            return pd.DataFrame(columns=COLUMNS)  # yf.download는 실패하면 빈 결과를 돌려줌
+        if self.listed_at is not None:
+            start = max(start, self.listed_at)
+        index = pd.date_range(pd.Timestamp(start).ceil('h'), end, freq='h', name='Datetime')
+        return pd.DataFrame({column: 1.0 for column in COLUMNS}, index=index)
+
+    def __call__(self, ticker, start, end, interval):
+        self.calls.append((ticker, start, end))
+        if isinstance(ticker, list):
+            frames = {name: self.bars(start, end) for name in ticker}
+            return pd.concat(frames, axis=1).swaplevel(axis=1)  # (Price, Ticker) 형태의 컬럼
+        return self.bars(start, end)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(str(tmp_path / 'bars.sqlite3'))
+
+
+def weeks_ago(weeks):
+    return datetime.now(timezone.utc) - timedelta(weeks=weeks)
+
+
+def test_first_fill_downloads_whole_window(store):
+    downloader = StubDownloader()
+    data = store.refresh('A', '1h', 1, downloader)
+    assert len(downloader.calls) == 1
+    assert downloader.calls[0][1] == pytest.approx(weeks_ago(1), abs=timedelta(seconds=5))
+    assert data.index[0] >= weeks_ago(1) - timedelta(seconds=5)
+    assert len(data) >= 7 * 24 - 1
+
+
+def test_refresh_downloads_only_after_last_bar(store):
+    downloader = StubDownloader()
+    store.refresh('A', '1h', 1, downloader)
+    last = store.last_timestamp('A', '1h')
+    store.refresh('A', '1h', 1, downloader)
+    assert len(downloader.calls) == 2
+    assert pd.Timestamp(downloader.calls[1][1]) == last
+
+
+def test_longer_window_backfills_front(store):
+    downloader = StubDownloader()
+    store.refresh('A', '1h', 1, downloader)
+    covered = store.covered_since('A', '1h')
+    data = store.refresh('A', '1h', 2, downloader)
+    starts = [pd.Timestamp(start) for _, start, _ in downloader.calls[1:]]
+    assert len(starts) == 2  # 마지막 봉 이후와 앞부분
+    assert starts[1] == pytest.approx(weeks_ago(2), abs=timedelta(seconds=5))
+    assert downloader.calls[2][2] == covered.to_pydatetime()
+    assert data.index[0] < weeks_ago(1)
+    assert store.covered_since('A', '1h') < covered
+
+
+def test_empty_front_range_is_not_downloaded_again(store):
+    downloader = StubDownloader(listed_at=weeks_ago(0.5))
+    store.refresh('A', '1h', 1, downloader)
+    store.refresh('A', '1h', 4, downloader)  # 상장 전 구간은 빈 결과
+    assert store.covered_since('A', '1h') == pytest.approx(pd.Timestamp(weeks_ago(4)), abs=timedelta(seconds=5))
+    calls = len(downloader.calls)
+    store.refresh('A', '1h', 4, downloader)
+    assert len(downloader.calls) == calls + 1  # 마지막 봉 이후만 받음
+
+
+def test_failed_download_is_not_recorded_as_covered(store):
+    downloader = StubDownloader()
+    store.refresh('A', '1h', 1, downloader)
+    covered = store.covered_since('A', '1h')
+    downloader.failing = True
+    store.refresh('A', '1h', 4, downloader)
+    assert store.covered_since('A', '1h') == covered
+    downloader.failing = False
+    calls = len(downloader.calls)
+    store.refresh('A', '1h', 4, downloader)
+    assert len(downloader.calls) == calls + 2  # 앞부분을 다시 받음
+
+
+def test_refresh_many_groups_backfill_and_recent_tickers(store):
+    downloader = StubDownloader()
+    store.refresh('A', '1h', 1, downloader)
+    last = store.last_timestamp('A', '1h')
+    downloader.calls.clear()
+
+    frames = store.refresh_many(['A', 'B'], '1h', 1, downloader)
+    assert [tickers for tickers, _, _ in downloader.calls] == [['B'], ['A']]
+    assert downloader.calls[0][1] == pytest.approx(weeks_ago(1), abs=timedelta(seconds=5))
+    assert pd.Timestamp(downloader.calls[1][1]) == last
+    assert len(frames['A']) == len(frames['B'])
+
+    downloader.calls.clear()
+    store.refresh_many(['A', 'B'], '1h', 1, downloader)
+    assert [tickers for tickers, _, _ in downloader.calls] == [['A', 'B']]
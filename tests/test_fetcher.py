@@ -0,0 +1,148 @@
+"""
+백그라운드 작업(fetcher)의 회로 차단기, 이전 결과 대체, 일부 항목 실패 처리를 확인하는 테스트
+"""
+import threading
+import time
+
+import pytest
+
+import fetcher
+from fetcher import Breaker, CircuitOpenError, PartialResultError
+
+
+@pytest.fixture(autouse=True)
+def reset(monkeypatch):
+    monkeypatch.setattr(fetcher, '_breakers', {})
+    monkeypatch.setattr(fetcher, '_last_good', {})
+    monkeypatch.setattr(fetcher, 'RETRY_BACKOFF', 0.1)
+    monkeypatch.setattr(fetcher, 'STALE_WAIT', 0.3)
+
+
+class Source:
+    """
+    호출마다 정해 둔 동작(값 반환, 예외, 지연)을 따르는 가짜 소스 함수 (같은 함수라 작업 키가 같음)
+    """
+
+    def __init__(self):
+        self.value = 'first'
+        self.error = None
+        self.delay = 0
+        self.release = threading.Event()
+
+    def __call__(self, name):
+        if self.delay:
+            self.release.wait(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def test_breaker_opens_after_threshold_and_closes_on_success():
+    breaker = Breaker('investing')
+    for _ in range(fetcher.FAILURE_THRESHOLD - 1):
+        breaker.failure()
+    assert not breaker.is_open and breaker.allow()
+    breaker.failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+
+    time.sleep(0.15)
+    assert breaker.allow()  # 대기 시간이 지나면 시험 요청 하나만 허용 (half-open)
+    assert not breaker.allow()
+    breaker.success()
+    assert not breaker.is_open and breaker.allow()
+
+
+def test_failed_probe_doubles_backoff():
+    breaker = Breaker('investing')
+    for _ in range(fetcher.FAILURE_THRESHOLD):
+        breaker.failure()
+    time.sleep(0.15)
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.retry_in() > 0.1
+    assert not breaker.allow()
+
+
+def test_open_breaker_fails_without_calling_source():
+    source = Source()
+    for _ in range(fetcher.FAILURE_THRESHOLD):
+        fetcher.get_breaker('investing').failure()
+    job = fetcher.submit('quote', 'investing', source, 'a')
+    with pytest.raises(CircuitOpenError):
+        job.result()
+
+
+def test_failure_falls_back_to_previous_result():
+    source = Source()
+    assert fetcher.submit('quote', 'investing', source, 'a').result() == 'first'
+    source.error = ValueError('down')
+    job = fetcher.submit('quote', 'investing', source, 'a')
+    assert job.result() == 'first'
+    assert isinstance(job.stale_reason, ValueError)
+    assert job.stale_since is not None
+
+
+def test_failure_without_previous_result_raises():
+    source = Source()
+    source.error = ValueError('down')
+    with pytest.raises(ValueError):
+        fetcher.submit('quote', 'investing', source, 'a').result()
+
+
+def test_jobs_started_together_share_stale_wait():
+    source = Source()
+    names = ['a', 'b', 'c']
+    for name in names:
+        fetcher.submit(name, 'sheets', source, name).result()
+    source.delay = 5
+    jobs = fetcher.start({name: ('sheets', source, name) for name in names})
+    start = time.monotonic()
+    values = [jobs[name].result() for name in names]
+    elapsed = time.monotonic() - start
+    source.release.set()
+    assert values == ['first'] * 3
+    assert all(jobs[name].stale_since is not None for name in names)
+    assert elapsed < 0.3 + 0.2  # 작업마다 STALE_WAIT를 따로 기다리지 않음
+
+
+def test_failing_source_returns_previous_result_at_once():
+    source = Source()
+    fetcher.submit('quote', 'investing', source, 'a').result()
+    fetcher.get_breaker('investing').failure()
+    source.delay = 5
+    job = fetcher.submit('quote', 'investing', source, 'a')
+    start = time.monotonic()
+    assert job.result() == 'first'
+    assert time.monotonic() - start < 0.1
+    source.release.set()
+
+
+def test_partial_result_is_failure_and_keeps_previous_items():
+    key = fetcher._job_key('yahoo', 'pairs:evaluate', (), {})
+    fetcher._last_good[key] = ({'jpy': 'old jpy', 'usd': 'old usd'}, 100.0)
+    error = ValueError('no data')
+    with pytest.raises(PartialResultError) as info:
+        fetcher._guarded(key, lambda: {'jpy': 'new jpy', 'usd': error})
+    assert info.value.results == {'jpy': 'new jpy', 'usd': error}
+    assert fetcher.get_breaker('yahoo').failures == 1
+    # 실패한 항목은 이전 결과로 남기고 받은 시각은 바꾸지 않음
+    assert fetcher._last_good[key] == ({'jpy': 'new jpy', 'usd': 'old usd'}, 100.0)
+
+
+def test_partial_result_is_filled_from_previous_result():
+    source = Source()
+    source.value = {'jpy': 1, 'usd': 2}
+    assert fetcher.submit('pairs', 'yahoo', source, 'a').result() == {'jpy': 1, 'usd': 2}
+    error = ValueError('no data')
+    source.value = {'jpy': 3, 'usd': error}
+    job = fetcher.submit('pairs', 'yahoo', source, 'a')
+    assert job.result() == {'jpy': 3, 'usd': 2}
+    assert isinstance(job.stale_reason, PartialResultError)
+
+
+def test_partial_result_without_previous_result_is_returned():
+    source = Source()
+    error = ValueError('no data')
+    source.value = {'jpy': 3, 'usd': error}
+    assert fetcher.submit('pairs', 'yahoo', source, 'a').result() == {'jpy': 3, 'usd': error}
@@ -0,0 +1,19 @@
+"""
+지표 계산(indicators.py)의 조건 판정을 확인하는 테스트
+"""
+import pytest
+
+import indicators
+
+
+@pytest.mark.parametrize('invert, today_quote, quote_mean, expected', [
+    (True, 0.112, 0.110, True),    # 엔화: 시세가 평균보다 높으면 원화 환율(역수)은 평균보다 낮음
+    (True, 0.108, 0.110, False),
+    (False, 1340, 1350, True),
+    (False, 1360, 1350, False),
+])
+def test_condition1_compares_same_unit(invert, today_quote, quote_mean, expected):
+    precision = 4 if invert else 2
+    values = indicators.derive(38000, today_quote, 38000, quote_mean, 38000, quote_mean, 0.4, invert, precision)
+    assert bool(values['condition1']) is expected
+    assert (values['today_fx'] < values['avg_fx']) == expected
@@ -0,0 +1,86 @@
+"""
+프로세스 전역 TTL + LRU 캐시(market_cache.TTLCache)의 동작을 확인하는 테스트
+"""
+import threading
+import time
+
+import pytest
+
+from market_cache import TTLCache
+
+
+def test_concurrent_requests_load_once():
+    cache = TTLCache()
+    calls = []
+    started = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('key', loader, 60)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == ['value'] * 8
+
+
+def test_value_expires_after_ttl():
+    cache = TTLCache()
+    values = iter(['old', 'new'])
+    assert cache.get_or_load('key', lambda: next(values), 0.05) == 'old'
+    assert cache.get_or_load('key', lambda: next(values), 0.05) == 'old'
+    time.sleep(0.1)
+    assert cache.get_or_load('key', lambda: next(values), 0.05) == 'new'
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.get_or_load('a', lambda: 1, 60)
+    cache.get_or_load('b', lambda: 2, 60)
+    cache.get_or_load('a', lambda: 0, 60)  # a를 최근에 쓴 항목으로 만듦
+    cache.get_or_load('c', lambda: 3, 60)
+    assert cache.get_or_load('a', lambda: 'reloaded', 60) == 1
+    assert cache.get_or_load('b', lambda: 'reloaded', 60) == 'reloaded'
+
+
+def test_error_is_shared_with_waiters_and_not_cached():
+    cache = TTLCache()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError('boom')
+
+    errors = []
+
+    def request():
+        try:
+            cache.get_or_load('key', failing, 60)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=request) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(errors) == 5 and all(error is errors[0] for error in errors)
+    assert cache.get_or_load('key', lambda: 'ok', 60) == 'ok'  # 실패는 캐시하지 않음
+
+
+def test_invalidate_forces_reload():
+    cache = TTLCache()
+    cache.get_or_load('key', lambda: 1, 60)
+    cache.invalidate('key')
+    assert cache.get_or_load('key', lambda: 2, 60) == 2
+    with pytest.raises(KeyError):
+        cache.get_or_load('key2', lambda: {}['missing'], 60)
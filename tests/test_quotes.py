@@ -0,0 +1,57 @@
+"""
+저장해 둔 인베스팅닷컴 페이지(fixtures/investing)와 로컬 서버로 가격 추출 / 요청 동작을 확인하는 테스트
+"""
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+
+import bench_quotes
+import quotes
+from market_cache import TTLCache
+
+
+@pytest.mark.parametrize('name, expected', sorted(bench_quotes.FIXTURES.items()))
+def test_extract_price_from_fixture(name, expected):
+    assert quotes.extract_price(bench_quotes.load_fixture(name)) == expected
+
+
+def test_extract_price_missing():
+    assert quotes.extract_price(b'<html><body><div>no price</div></body></html>') is None
+
+
+@pytest.fixture
+def server():
+    counts = {}
+    pages = {name: bench_quotes.load_fixture(name) for name in bench_quotes.FIXTURES}
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), bench_quotes.make_handler(pages, counts))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", counts
+    httpd.shutdown()
+
+
+def test_fetch_quote_caches_and_revalidates(server):
+    base, counts = server
+    url = f"{base}/jpy-krw.html"
+    cache = TTLCache(maxsize=4)
+    assert quotes.fetch_quote(url, cache=cache) == '9.0312'
+    assert quotes.fetch_quote(url, cache=cache) == '9.0312'
+    assert counts['ok'] == 1  # 캐시 적중
+
+    cache.clear()
+    assert quotes._validators[url][0] is not None
+    assert quotes.fetch_quote(url, cache=cache) == '9.0312'  # ETag로 재검증 (304)
+    assert counts['ok'] == 2
+
+
+def test_fetch_quote_retries_server_errors(server):
+    base, counts = server
+    assert quotes.fetch_quote(f"{base}/flaky/jpy-krw.html", cache=TTLCache()) == '9.0312'
+    assert counts['flaky'] == 2  # 503 한 번 뒤 재시도
+
+
+def test_fetch_quote_raises_when_page_missing(server):
+    base, _ = server
+    with pytest.raises(requests.HTTPError):
+        quotes.fetch_quote(f"{base}/missing.html", cache=TTLCache())
@@ -0,0 +1,93 @@
+"""
+레플리카끼리 공유하는 캐시(shared_cache)의 SQLite 저장소, 갱신 잠금, 만료된 값 재사용을 확인하는 테스트
+"""
+import pickle
+import threading
+import time
+
+import pytest
+
+import shared_cache
+from shared_cache import SharedCache, SQLiteBackend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteBackend(str(tmp_path / 'shared.sqlite3'))
+
+
+def test_sqlite_backend_expires_values(backend):
+    backend.set('key', b'value', 0.1)
+    assert backend.get('key') == b'value'
+    time.sleep(0.15)
+    assert backend.get('key') is None
+
+
+def test_lock_is_held_until_released_by_owner(backend):
+    assert backend.add('lock', b'a', 60)
+    assert not backend.add('lock', b'b', 60)
+    backend.release('lock', b'b')  # 다른 프로세스의 잠금은 풀지 않음
+    assert not backend.add('lock', b'b', 60)
+    backend.release('lock', b'a')
+    assert backend.add('lock', b'b', 60)
+
+
+def test_expired_lock_can_be_taken(backend):
+    assert backend.add('lock', b'a', 0.1)
+    time.sleep(0.15)
+    assert backend.add('lock', b'b', 60)
+
+
+def test_other_replicas_use_stale_value_while_one_refreshes(backend):
+    # 유효 기한은 지났지만 저장소에는 남아 있는 값
+    backend.set(SharedCache._name('key'), pickle.dumps((time.time() - 1, 'old')), 60)
+
+    calls = []
+    refreshing = threading.Event()
+
+    def slow_loader():
+        calls.append(1)
+        refreshing.set()
+        time.sleep(0.5)
+        return 'new'
+
+    leader = threading.Thread(target=lambda: SharedCache(backend).get_or_load('key', slow_loader, 60))
+    leader.start()
+    refreshing.wait()
+    start = time.monotonic()
+    values = [SharedCache(backend).get_or_load('key', slow_loader, 60) for _ in range(3)]
+    elapsed = time.monotonic() - start
+    leader.join()
+
+    assert values == ['old'] * 3
+    assert elapsed < 0.5  # 갱신을 기다리지 않음
+    assert calls == [1]
+    assert SharedCache(backend).get_or_load('key', slow_loader, 60) == 'new'
+
+
+def test_replica_waits_for_refresh_when_no_previous_value(backend, monkeypatch):
+    monkeypatch.setattr(shared_cache, 'POLL_INTERVAL', 0.02)
+    calls = []
+    refreshing = threading.Event()
+
+    def slow_loader():
+        calls.append(1)
+        refreshing.set()
+        time.sleep(0.2)
+        return 'value'
+
+    leader = threading.Thread(target=lambda: SharedCache(backend).get_or_load('key', slow_loader, 60))
+    leader.start()
+    refreshing.wait()
+    assert SharedCache(backend).get_or_load('key', slow_loader, 60) == 'value'
+    leader.join()
+    assert calls == [1]
+
+
+def test_rejected_value_is_not_cached(backend):
+    cache = SharedCache(backend)
+    is_valid = lambda value: value is not None
+    assert cache.get_or_load('key', lambda: None, 60, is_valid) is None
+    # 프로세스 안의 캐시에도 남지 않아 바로 다시 계산함
+    assert cache.get_or_load('key', lambda: 'value', 60, is_valid) == 'value'
+    assert SharedCache(backend).get_or_load('key', lambda: 'other', 60) == 'value'
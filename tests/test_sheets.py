@@ -0,0 +1,60 @@
+"""
+가짜 Sheets 서버(fake_sheets.py)로 마지막 행만 읽기(sheets.read_tails)를 확인하는 테스트
+"""
+import threading
+from datetime import datetime
+
+import pytest
+
+import bench_sheets
+import fake_sheets
+import sheets
+
+NAMES = bench_sheets.NAMES
+
+
+@pytest.fixture(params=[0, 500], ids=['grid-fits', 'empty-grid-rows'])
+def fake(request, monkeypatch):
+    # 격자가 데이터와 같은 크기인 시트와 데이터 뒤에 빈 격자 행이 붙은 시트 모두 확인
+    server = fake_sheets.serve(0, fake_sheets.make_rows(3000, start=datetime(2030, 1, 1)), request.param)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(sheets, 'SHEETS_ENDPOINT', f"http://127.0.0.1:{server.server_address[1]}/")
+    monkeypatch.setattr(sheets, '_service', None)
+    bench_sheets.reset(sheets)
+    yield server.fake
+    server.shutdown()
+    sheets._service = None
+    bench_sheets.reset(sheets)
+
+
+def expected_tails(fake):
+    return [fake.sheets[sheets.RANGES[name][0]][1:][-sheets.TAIL_ROWS[name]:] for name in NAMES]
+
+
+def test_read_tails_matches_full_sheet(fake):
+    assert sheets.read_tails(NAMES) == expected_tails(fake)
+
+
+def test_read_tails_picks_up_appended_rows(fake):
+    sheets.read_tails(NAMES)
+    for count in [1, 3, sheets.TAIL_SLACK + 5]:  # 마지막 칸(TAIL_SLACK)을 넘게 추가되면 위치를 다시 구함
+        for k in range(count):
+            bench_sheets.append_row(fake, len(fake.sheets['엔_4주']) + k)
+        assert sheets.read_tails(NAMES) == expected_tails(fake)
+
+
+def test_read_tails_short_sheet(fake):
+    fake.sheets = fake_sheets.make_rows(10, start=datetime(2030, 1, 1))
+    bench_sheets.reset(sheets)
+    assert sheets.read_tails(NAMES) == expected_tails(fake)
+    assert [len(rows) for rows in sheets.read_tails(NAMES)] == [10] * len(NAMES)
+
+
+def test_read_frames_parses_tails(fake, monkeypatch):
+    monkeypatch.setattr(sheets, '_values_cache', sheets.TTLCache(maxsize=8))
+    frames = sheets.read_frames(NAMES)
+    for name in NAMES:
+        assert len(frames[name]) == sheets.TAIL_ROWS[name]
+    last = fake.sheets['엔_4주_환율만'][-1]
+    assert frames['jpy_trend']['현재날짜'].iloc[-1] == datetime.strptime(last[0], sheets.DATE_FORMAT)
+    assert frames['jpy_trend']['현재원엔환율'].iloc[-1] == pytest.approx(float(last[2]))
@@ -0,0 +1,61 @@
+"""
+스트리밍 지표(streaming.py)가 일괄 계산(indicators.sweep)과 같은 값을 내는지 확인하는 테스트
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import bench_streaming
+import indicators
+from streaming import RollingMedian, RollingWindow, StreamingIndicators
+
+
+def test_rolling_median_matches_numpy():
+    rng = np.random.default_rng(0)
+    median = RollingMedian()
+    values = []
+    for _ in range(2000):
+        if values and rng.random() < 0.4:
+            value = values.pop(int(rng.integers(len(values))))
+            median.remove(value)
+        else:
+            value = float(rng.integers(0, 50))  # 같은 값이 자주 나오도록 (지연 삭제 확인)
+            values.append(value)
+            median.add(value)
+        assert len(median) == len(values)
+        if values:
+            assert median.median() == np.median(values)
+
+
+def test_rolling_window_evicts_and_replaces_last():
+    window = RollingWindow(pd.Timedelta(hours=2))
+    start = pd.Timestamp('2026-10-16', tz='UTC')
+    for hour, value in enumerate([1.0, 2.0, 3.0, 10.0]):
+        window.push(start + pd.Timedelta(hours=hour), value)
+    window.push(start + pd.Timedelta(hours=3), 4.0)  # 진행 중인 봉의 갱신
+    window.evict(start + pd.Timedelta(hours=3))
+    assert len(window) == 3
+    assert window.mean() == 3.0
+    assert window.median() == 3.0
+    with pytest.raises(ValueError):
+        window.push(start, 5.0)
+
+
+@pytest.mark.parametrize('invert, precision, quote_base, index_base', bench_streaming.CASES)
+def test_from_history_matches_sweep(invert, precision, quote_base, index_base):
+    index, quote = bench_streaming.make_history(quote_base, index_base)
+    now = quote.index[-1] + pd.Timedelta(minutes=1)
+    for weeks in indicators.WINDOWS:
+        streaming = StreamingIndicators.from_history(index, quote, weeks, invert, precision)
+        expected = indicators.sweep(index, quote, [weeks], invert, precision, now=now).iloc[0].to_dict()
+        assert bench_streaming.compare(expected, streaming.values(now), precision) != 'different', weeks
+
+
+@pytest.mark.parametrize('invert, precision, quote_base, index_base', bench_streaming.CASES)
+@pytest.mark.parametrize('weeks', [1, 4, 13, 52])
+def test_incremental_updates_match_sweep(invert, precision, quote_base, index_base, weeks):
+    # 시간봉을 하나씩 넣을 때마다 일괄 계산과 비교 (반올림 .5 경계에서 한 단위 차이만 허용)
+    index, quote = bench_streaming.make_history(quote_base, index_base, seed=weeks)
+    boundaries, mismatches, _, _ = bench_streaming.replay(index, quote, weeks, invert, precision, 60)
+    assert mismatches == 0
+    assert boundaries <= 3